@@ -0,0 +1,33 @@
+'''
+import unreal_engine as ue
+ue.py_exec("BatchGenerator.py")
+'''
+
+import os
+
+import Generator
+Generator.reload()
+
+import LoggingUtil
+import unreal_engine as ue
+
+ROOT_DIR = r"F:\HL\Phoenix-Jsons\Content"
+# Stored alongside the generated assets, delete it to force a full rebuild
+MANIFEST_PATH = os.path.join(ue.get_content_dir(), "ConversionManifest.json")
+
+# Parsed exports are cached here between runs when set, safe to delete at any time
+CACHE_DIR = None
+# SQLite catalog of ROOT_DIR used for discovery and unresolved references when set, refreshed every run
+CATALOG_PATH = None
+# Exports read and decoded ahead on a background thread while the current one is generated, 0 disables
+PREFETCH_DEPTH = 4
+
+# Per stage timings are written here when set
+PROFILE_PATH = None
+# Structured log records are appended here as json lines when set
+LOG_PATH = None
+
+# Per property headers are DEBUG, use LoggingUtil.SILENT to drop everything
+LEVEL = LoggingUtil.INFO
+
+report = Generator.batch(ROOT_DIR, MANIFEST_PATH, CACHE_DIR, PROFILE_PATH, LOG_PATH, LEVEL, CATALOG_PATH, PREFETCH_DEPTH)
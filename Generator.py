@@ -0,0 +1,65 @@
+'''
+Entry point of the editor scripts, BlueprintGenerator.py, WidgetGenerator.py and BatchGenerator.py only hold their settings and call in here.
+
+Every project module is imported here so Tools.HotReload sees them all after the first run.
+'''
+
+import LoggingUtil
+import ProfilingUtil
+import UEUtil
+import WidgetUtil
+import Tools.FModel as FTools
+import Tools.Plan as Plan
+import Tools.UE as UETools
+import Tools.Blueprint as BPGenerator
+import Tools.Widget as Widget
+import Tools.Manifest as Manifest
+import Tools.Batch as Batch
+import Tools.Catalog as Catalog
+import Tools.HotReload as HotReload
+
+# Reloads the modules changed since the last run, returns their names
+def reload():
+    reloaded = HotReload.reload_changed()
+    if len(reloaded) > 0:
+        LoggingUtil.log(f"Reloaded {', '.join(reloaded)}", level=LoggingUtil.DEBUG)
+    return reloaded
+
+def blueprint(json_path : str):
+    LoggingUtil.reset()
+    return BPGenerator.generate(FTools.FModelJson(json_path))
+
+# Each export is generated at the package it was exported from, export_dir replaces paths when set
+def widgets(paths = (), export_dir : str = None, workers : int = None, out_suffix : str = ""):
+    LoggingUtil.reset()
+    if export_dir is not None:
+        paths = [x["Path"] for x in Batch.discover_exports(export_dir) if x["Kind"] == Batch.WIDGET]
+
+    report = WidgetUtil.generate_batch(list(paths), workers, out_suffix)
+
+    LoggingUtil.log(f"Converted {len(report['Converted'])}/{len(paths)} widgets")
+    for path, error in report["Failed"].items():
+        LoggingUtil.log(f"FAILED: {path}\n{error}", level=LoggingUtil.ERROR)
+    return report
+
+def batch(root_dir : str, manifest_path : str = None, cache_dir : str = None, profile_path : str = None,
+          log_path : str = None, level : int = LoggingUtil.INFO, catalog_path : str = None,
+          prefetch_depth : int = FTools.PREFETCH_DEPTH):
+    # Settings are module state that outlives the run, they are restored so later calls aren't affected
+    previous_level = LoggingUtil.min_level
+    previous_cache_dir = FTools.default_cache_dir
+    LoggingUtil.reset()
+    LoggingUtil.set_level(level)
+    if log_path is not None: LoggingUtil.open_sink(log_path)
+    ProfilingUtil.reset()
+    if profile_path is not None: ProfilingUtil.enable()
+    FTools.set_cache_dir(cache_dir)
+
+    try:
+        return Batch.run(root_dir, manifest_path=manifest_path, catalog_path=catalog_path, prefetch_depth=prefetch_depth)
+    finally:
+        if profile_path is not None: ProfilingUtil.dump(profile_path)
+        ProfilingUtil.disable()
+        LoggingUtil.close_sink()
+        LoggingUtil.set_level(previous_level)
+        FTools.set_cache_dir(previous_cache_dir)
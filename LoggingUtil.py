@@ -1,8 +1,34 @@
 import inspect
+import json
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+# Above every level, nothing is recorded
+SILENT = 100
 
 current_indent = 0
 INDENT_SIZE = 2
 
+# Records below this level are dropped before any formatting
+min_level = DEBUG
+console = True
+
+# Most recent records, kept for inspection after a run
+BUFFER_SIZE = 10000
+buffer = deque(maxlen=BUFFER_SIZE)
+
+# Records waiting to be written to the file sink
+FLUSH_SIZE = 500
+_sink = None
+_pending = []
+
+# Fields added to every record, e.g. the asset being converted
+context = {}
+
 def reset():
     global current_indent
     current_indent = 0
@@ -15,11 +41,58 @@ def undent():
     global current_indent
     current_indent -= 1
 
-def log(*data):
-    print(f"{current_indent * INDENT_SIZE * ' '}{' '.join([str(x) for x in data])}")
+def set_level(level : int):
+    global min_level
+    min_level = level
+
+def set_console(enabled : bool):
+    global console
+    console = enabled
+
+def is_enabled(level : int):
+    return level >= min_level
+
+def set_context(**fields):
+    for key, value in fields.items():
+        if value is None: context.pop(key, None)
+        else: context[key] = value
+
+# Records are appended to path as json lines, written in batches of FLUSH_SIZE
+def open_sink(path : str):
+    global _sink
+    close_sink()
+    _sink = open(path, "a", encoding="utf8")
+
+def flush():
+    if _sink is None or len(_pending) == 0: return
+    _sink.write("".join(json.dumps(record) + "\n" for record in _pending))
+    _sink.flush()
+    _pending.clear()
+
+def close_sink():
+    global _sink
+    flush()
+    if _sink is not None: _sink.close()
+    _sink = None
+
+def _emit(level : int, message : str, fields : dict):
+    record = {"time": time.time(), "level": level, "indent": current_indent, "message": message}
+    record.update(context)
+    record.update(fields)
+    buffer.append(record)
+    if console:
+        print(f"{current_indent * INDENT_SIZE * ' '}{message}")
+    if _sink is not None:
+        _pending.append(record)
+        if len(_pending) >= FLUSH_SIZE: flush()
+
+# Extra keyword fields (object, property, outcome, ...) are stored on the structured record
+def log(*data, level : int = INFO, **fields):
+    if level < min_level: return
+    _emit(level, ' '.join([str(x) for x in data]), fields)
 
-def header(data):
-    log(f"> {data}")
+def header(data, level : int = INFO, **fields):
+    log(f"> {data}", level=level, **fields)
     indent()
 
 def debug_members(obj):
@@ -0,0 +1,121 @@
+import functools
+import json
+import threading
+import time
+
+# Spans and counters are no-ops until enable() is called
+enabled = False
+current_asset = ""
+
+# asset -> stage -> [calls, seconds]
+_stats = {}
+# Spans end on the prefetch and planning threads too
+_lock = threading.Lock()
+# Asset of the spans of one thread, instead of current_asset
+_thread = threading.local()
+
+def enable():
+    global enabled
+    enabled = True
+
+def disable():
+    global enabled
+    enabled = False
+
+def reset():
+    global current_asset
+    current_asset = ""
+    with _lock: _stats.clear()
+
+# Attributes the following spans and counters to an asset
+def set_asset(name : str):
+    global current_asset
+    current_asset = name
+
+# Attributes the spans of the calling thread to an asset until it is set back to None
+def set_thread_asset(name : str = None):
+    _thread.asset = name
+
+def _record(stage : str, calls : int, seconds : float):
+    asset = getattr(_thread, "asset", None)
+    if asset is None: asset = current_asset
+    with _lock:
+        stages = _stats.setdefault(asset, {})
+        entry = stages.get(stage)
+        if entry is None:
+            stages[stage] = [calls, seconds]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage : str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.stage, 1, time.perf_counter() - self.start)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NULL_SPAN = _NullSpan()
+
+# with ProfilingUtil.span("stage"): ...
+def span(stage : str):
+    if not enabled: return _NULL_SPAN
+    return _Span(stage)
+
+def count(stage : str, calls : int = 1):
+    if enabled: _record(stage, calls, 0.0)
+
+# Decorator version of span, nested calls of the same stage are counted inclusively
+def timed(stage : str):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled: return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(stage, 1, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def report():
+    with _lock:
+        stats = {asset: {stage: tuple(entry) for stage, entry in asset_stats.items()} for asset, asset_stats in _stats.items()}
+    stages = {}
+    for asset_stats in stats.values():
+        for stage, (calls, seconds) in asset_stats.items():
+            total = stages.setdefault(stage, {"Calls": 0, "Seconds": 0.0})
+            total["Calls"] += calls
+            total["Seconds"] += seconds
+    return {
+        "Stages": stages,
+        "Assets": {
+            asset: {stage: {"Calls": calls, "Seconds": seconds} for stage, (calls, seconds) in asset_stats.items()}
+            for asset, asset_stats in stats.items()
+        },
+    }
+
+def dump(path : str):
+    with open(path, "w", encoding="utf8") as fp:
+        json.dump(report(), fp, indent=2, sort_keys=True)
+
+def log_report():
+    import LoggingUtil
+    LoggingUtil.header("Profile")
+    stages = report()["Stages"]
+    for stage in sorted(stages, key=lambda s: -stages[s]["Seconds"]):
+        LoggingUtil.log(f"{stage}: {stages[stage]['Seconds']:.3f}s / {stages[stage]['Calls']} calls")
+    LoggingUtil.undent()
@@ -0,0 +1,289 @@
+'''
+Offline benchmark of the converters against the stand-in unreal_engine module in Testing/FakeUE.
+
+python Testing/Benchmark.py [--sizes 100 1000 5000] [--repeat 3] [--json bench_output.txt] [--profile profile.json]
+
+Synthetic Blueprint and WidgetBlueprint exports are generated for each size and every stage
+(load, load_cached, load_compact, index, plan, apply, widget) is timed separately so regressions can be traced to a stage.
+'''
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "Testing", "FakeUE"))
+sys.path.insert(0, ROOT_DIR)
+
+import unreal_engine as ue
+
+import LoggingUtil
+import ProfilingUtil
+import Tools.FModel as FTools
+import Tools.Plan as Plan
+import Tools.UE as UETools
+import Tools.Blueprint as BPGenerator
+import WidgetUtil
+
+PACKAGE = "/Game/Bench/BP_Bench"
+WIDGET_PACKAGE = "/Game/Bench/WBP_Bench"
+
+POINT_STRUCT = "/Script/CoreUObject.BenchPoint"
+
+def register_types():
+    ue.reset()
+    ue.register_struct("Vector", {})
+    ue.register_struct("BenchPoint", {"Location": "FVector", "Weight": "FloatProperty", "Name": "NameProperty"})
+    ue.register_enum("EBenchMode", ["Off", "Slow", "Fast"])
+    ue.register_class("BenchComponent", {
+        "bVisible": "BoolProperty",
+        "Speed": "FloatProperty",
+        "Offset": "FVector",
+        "Tags": "ArrayProperty<NameProperty>",
+        "Points": f"ArrayProperty<UScriptStruct:{POINT_STRUCT}>",
+        "Mode": "EnumProperty",
+        "SplinePoints": "ArrayProperty<FVector>",
+        "Instances": "ArrayProperty<FTransform>",
+    }, "SceneComponent")
+    for name in ("CanvasPanel", "CanvasPanelSlot", "VerticalBox", "VerticalBoxSlot", "TextBlock"):
+        ue.register_class(name)
+    UETools.invalidate_object_cache()
+    UETools.clear_setter_cache()
+
+def ref(object_name : str, index : int, package : str = PACKAGE):
+    return {"ObjectName": object_name, "ObjectPath": f"{package}.{index}"}
+
+ENGINE_ACTOR = {"ObjectName": "Class'Actor'", "ObjectPath": "/Script/Engine"}
+BENCH_COMPONENT = {"ObjectName": "Class'BenchComponent'", "ObjectPath": "/Script/Engine"}
+
+VARIABLE_TYPES = (
+    ({"Type": "IntProperty"}, 7),
+    ({"Type": "BoolProperty"}, True),
+    ({"Type": "FloatProperty"}, 1.5),
+    ({"Type": "StrProperty"}, "Value"),
+    ({"Type": "ArrayProperty", "Inner": {"Type": "IntProperty"}}, [1, 2, 3]),
+    ({"Type": "ObjectProperty", "PropertyClass": ENGINE_ACTOR}, None),
+)
+
+def make_blueprint_export(size : int):
+    n_vars = max(1, size // 10)
+    n_funcs = max(1, size // 10)
+    n_components = max(1, size // 20)
+    n_points = max(1, size // 10)
+
+    nodes = [
+        {
+            "Type": "BlueprintGeneratedClass",
+            "Name": "BP_Bench_C",
+            "Outer": "BP_Bench",
+            "SuperStruct": ENGINE_ACTOR,
+            "ClassDefaultObject": ref("BP_Bench_C'Default__BP_Bench_C'", 1),
+            "ChildProperties": [
+                dict(VARIABLE_TYPES[i % len(VARIABLE_TYPES)][0], Name=f"Var{i}", PropertyFlags=5)
+                for i in range(n_vars)
+            ],
+        },
+        {
+            "Type": "BP_Bench_C",
+            "Name": "Default__BP_Bench_C",
+            "Outer": "BP_Bench",
+            "Properties": {
+                f"Var{i}": VARIABLE_TYPES[i % len(VARIABLE_TYPES)][1] for i in range(n_vars)
+            },
+        },
+    ]
+
+    for i in range(n_funcs):
+        is_event = i % 2 == 0
+        nodes.append({
+            "Type": "Function",
+            "Name": f"Event{i}" if is_event else f"Function{i}",
+            "Outer": "BP_Bench_C",
+            "FunctionFlags": 0x00000800 if is_event else 0x00400000,
+            "ChildProperties": [
+                {"Type": "IntProperty", "Name": "In", "PropertyFlags": 0x80},
+                {"Type": "FloatProperty", "Name": "Out", "PropertyFlags": 0x180},
+            ],
+        })
+
+    for i in range(n_components):
+        nodes.append({
+            "Type": "SCS_Node",
+            "Name": f"SCS_Node_{i}",
+            "Outer": "SimpleConstructionScript",
+            "Properties": {
+                "ComponentClass": BENCH_COMPONENT,
+                "InternalVariableName": f"Component{i}",
+                "ComponentTemplate": ref(f"BenchComponent'BP_Bench_C:Component{i}_GEN_VARIABLE'", len(nodes) + 1),
+            },
+        })
+        nodes.append({
+            "Type": "BenchComponent",
+            "Name": f"Component{i}_GEN_VARIABLE",
+            "Outer": "BP_Bench_C",
+            "Properties": {
+                "bVisible": False,
+                "Speed": float(i),
+                "Offset": {"X": 1.0, "Y": 2.0, "Z": 3.0},
+                "Tags": ["A", "B"],
+                "Points": [
+                    {"Location": {"X": j, "Y": 0.0, "Z": 0.0}, "Weight": 1.0, "Name": f"P{j}"}
+                    for j in range(n_points)
+                ],
+                "Mode": "EBenchMode::Fast",
+                "SplinePoints": [{"X": float(j), "Y": 0.0, "Z": 1.0} for j in range(n_points)],
+                "Instances": [
+                    {
+                        "Translation": {"X": float(j), "Y": 0.0, "Z": 0.0},
+                        "Rotation": {"X": 0.0, "Y": 0.0, "Z": 0.0, "W": 1.0},
+                        "Scale3D": {"X": 1.0, "Y": 1.0, "Z": 1.0},
+                    }
+                    for j in range(n_points)
+                ],
+            },
+        })
+
+    return nodes
+
+def make_widget_export(size : int, fanout : int = 4):
+    nodes = [
+        {
+            "Type": "WidgetBlueprintGeneratedClass",
+            "Name": "WBP_Bench_C",
+            "Outer": "WBP_Bench",
+            "ClassDefaultObject": ref("WBP_Bench_C'Default__WBP_Bench_C'", 1, WIDGET_PACKAGE),
+            "Properties": {"WidgetTree": ref("WidgetTree'WidgetTree'", 1, WIDGET_PACKAGE)},
+        },
+        {"Type": "WidgetTree", "Name": "WidgetTree", "Outer": "WBP_Bench_C", "Properties": {}},
+    ]
+
+    def add_widget(clz : str, name : str):
+        nodes.append({"Type": clz, "Name": name, "Outer": "WidgetTree", "Class": f"/Script/UMG.{clz}", "Properties": {}})
+        return len(nodes) - 1
+
+    root = add_widget("CanvasPanel", "Root")
+    nodes[1]["Properties"]["RootWidget"] = ref("CanvasPanel'Root'", root, WIDGET_PACKAGE)
+
+    queue = [root]
+    count = 1
+    while count < size and len(queue) > 0:
+        parent = queue.pop(0)
+        slots = []
+        for _ in range(fanout):
+            if count >= size: break
+            is_panel = count % 3 != 0
+            child = add_widget("VerticalBox" if is_panel else "TextBlock", f"Widget{count}")
+            count += 1
+            slot_class = "CanvasPanelSlot" if nodes[parent]["Type"] == "CanvasPanel" else "VerticalBoxSlot"
+            nodes.append({
+                "Type": slot_class,
+                "Name": f"{slot_class}_{count}",
+                "Outer": nodes[parent]["Name"],
+                "Class": f"/Script/UMG.{slot_class}",
+                "Properties": {"Content": ref(f"Widget'{nodes[child]['Name']}'", child, WIDGET_PACKAGE)},
+            })
+            slots.append(ref(f"{slot_class}'{slot_class}_{count}'", len(nodes) - 1, WIDGET_PACKAGE))
+            if is_panel: queue.append(child)
+        nodes[parent]["Properties"]["Slots"] = slots
+
+    return nodes
+
+@contextlib.contextmanager
+def silenced():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+    LoggingUtil.reset()
+
+def timed(func, repeat : int):
+    times = []
+    result = None
+    for _ in range(repeat):
+        with silenced():
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+    return result, {"Min": min(times), "Mean": sum(times) / len(times)}
+
+def bench_size(size : int, repeat : int, work_dir : str):
+    bp_path = os.path.join(work_dir, f"BP_Bench_{size}.json")
+    widget_path = os.path.join(work_dir, f"WBP_Bench_{size}.json")
+    with open(bp_path, "w") as fp: json.dump(make_blueprint_export(size), fp)
+    with open(widget_path, "w") as fp: json.dump(make_widget_export(size), fp)
+
+    results = {"Size": size, "Bytes": os.path.getsize(bp_path)}
+
+    fmodel, results["load"] = timed(lambda: FTools.FModelJson(bp_path), repeat)
+
+    cache_dir = os.path.join(work_dir, "cache")
+    FTools.FModelJson(bp_path, cache_dir=cache_dir)
+    _, results["load_cached"] = timed(lambda: FTools.FModelJson(bp_path, cache_dir=cache_dir), repeat)
+    _, results["load_compact"] = timed(lambda: FTools.FModelJson(bp_path, compact=True), repeat)
+
+    def load_streaming():
+        streamed = FTools.FModelJson(bp_path, streaming=True)
+        streamed.get_first_of_key("Type", "BlueprintGeneratedClass")
+        streamed.close()
+    _, results["load_streaming"] = timed(load_streaming, repeat)
+
+    def index():
+        indexed = FTools.FModelJson(bp_path)
+        for node in indexed.nodes():
+            indexed.get_first_of_key("Name", node["Name"])
+    _, results["index"] = timed(index, repeat)
+
+    plan, results["plan"] = timed(lambda: Plan.plan_blueprint(fmodel, bp_path), repeat)
+
+    def apply():
+        register_types()
+        BPGenerator.apply_plan(plan)
+    _, results["apply"] = timed(apply, repeat)
+
+    def widget():
+        register_types()
+        WidgetUtil.generate(WidgetUtil.load(widget_path), WIDGET_PACKAGE)
+    _, results["widget"] = timed(widget, repeat)
+
+    return results
+
+STAGES = ("load", "load_cached", "load_compact", "load_streaming", "index", "plan", "apply", "widget")
+
+def print_results(all_results : list):
+    print(f"{'size':>8} {'bytes':>12} " + " ".join(f"{stage:>15}" for stage in STAGES))
+    for results in all_results:
+        print(f"{results['Size']:>8} {results['Bytes']:>12} " + " ".join(
+            f"{results[stage]['Min'] * 1000:>13.2f}ms" for stage in STAGES
+        ))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the converters against the fake unreal_engine module")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", default=None, help="Also write the results as json to this path")
+    parser.add_argument("--profile", default=None, help="Write the ProfilingUtil report of all runs to this path")
+    args = parser.parse_args()
+
+    if args.profile is not None: ProfilingUtil.enable()
+
+    missing = ue.check_recorded_members()
+    if len(missing) > 0:
+        print(f"WARNING: stand-in exposes members not in Info/*Members.txt: {missing}")
+
+    all_results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            ProfilingUtil.set_asset(f"size {size}")
+            all_results.append(bench_size(size, args.repeat, work_dir))
+
+    print_results(all_results)
+    if args.json is not None:
+        with open(args.json, "w") as fp:
+            json.dump(all_results, fp, indent=2)
+    if args.profile is not None:
+        ProfilingUtil.dump(args.profile)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+'''
+In-memory stand-in for the subset of the UnrealEnginePython API the converters use, so they can run outside the editor.
+Put Testing/FakeUE on sys.path before importing any converter module.
+
+Only members recorded in Info/*Members.txt are exposed, see check_recorded_members().
+Types the generated classes and components have are declared with register_class/register_struct/register_enum.
+Struct typed properties are declared as "UScriptStruct:<struct path>", also inside containers.
+'''
+
+import itertools
+import os
+import re
+import uuid
+
+_objects = {}
+_classes = {}
+_guids = itertools.count()
+
+def _short_name(path : str):
+    return path.split(".")[-1].split("/")[-1].split(":")[-1]
+
+def _register(path : str, obj):
+    _objects[path] = obj
+    _objects.setdefault(_short_name(path), obj)
+
+def reset():
+    '''Forgets every asset and registered type'''
+    _objects.clear()
+    _classes.clear()
+    _register_builtins()
+
+class UObject:
+    def __init__(self, name : str = "", outer = None, clazz = None, path : str = None):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_outer", outer)
+        object.__setattr__(self, "_class", clazz)
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_props", {})
+        if clazz is not None:
+            for key, typeStr in clazz.get_schema().items():
+                self._props[key.lower()] = (key, _default_for_type(typeStr))
+
+    # Property lookup is case insensitive like FName
+    def __getattr__(self, key):
+        if key.startswith("_"): raise AttributeError(key)
+        found = self._props.get(key.lower())
+        if found is None: raise AttributeError(key)
+        return found[1]
+
+    def __setattr__(self, key, value):
+        name = self._props.get(key.lower(), (key, None))[0]
+        self._props[key.lower()] = (name, value)
+
+    def __repr__(self):
+        return f"<unreal_engine.UObject '{self._name}'>"
+
+    def get_name(self): return self._name
+    def get_class(self): return self._class
+    def get_path_name(self):
+        if self._path is not None: return self._path
+        if self._outer is not None: return f"{self._outer.get_path_name()}.{self._name}"
+        return self._name
+    def get_full_name(self): return f"{self._class.get_name() if self._class else 'Object'} {self.get_path_name()}"
+
+    def modify(self): return True
+    def post_edit_change(self): pass
+    def save_package(self, name = None): pass
+
+    def properties(self): return [name for name, _ in self._props.values()]
+    def get_property(self, key): return getattr(self, key)
+    def set_property(self, key, value): setattr(self, key, value)
+
+    def get_fproperty(self, key):
+        schema = self._class.get_schema() if self._class is not None else {}
+        for name, typeStr in schema.items():
+            if name.lower() == key.lower(): return FProperty(name, typeStr)
+        raise Exception(f"unable to find property {key}")
+
+    def enum_names(self): return list(self._props.get("__enum_names", (None, []))[1])
+
+class UClass(UObject):
+    def __init__(self, name : str, schema : dict = None, parent = None, path : str = None):
+        super().__init__(name, None, None, path or f"/Script/Engine.{name}")
+        object.__setattr__(self, "_schema", dict(schema or {}))
+        object.__setattr__(self, "_parent", parent)
+
+    def get_schema(self):
+        schema = self._parent.get_schema() if self._parent is not None else {}
+        schema.update(self._schema)
+        return schema
+
+    # Instancing a class like clz(name, outer)
+    def __call__(self, name : str = "", outer = None):
+        return UObject(name, outer, self)
+
+class UStruct(UObject):
+    def __init__(self, name : str, fields : dict, path : str = None):
+        super().__init__(name, None, None, path or f"/Script/CoreUObject.{name}")
+        object.__setattr__(self, "_fields", dict(fields))
+
+class UScriptStruct:
+    def __init__(self, struct : UStruct):
+        self._struct = struct
+        self._values = {key: _default_for_type(typeStr) for key, typeStr in struct._fields.items()}
+
+    def get_struct(self): return self._struct
+    def fields(self): return list(self._struct._fields.keys())
+    def get_field(self, key): return self._values[key]
+    def set_field(self, key, value): self._values[key] = value
+    def as_dict(self): return dict(self._values)
+
+    def get_fproperty(self, key):
+        return FProperty(key, self._struct._fields[key])
+
+class FProperty:
+    def __init__(self, name : str, typeStr : str):
+        self._name = name
+        self._typeStr = typeStr
+
+    def get_type_str(self): return _STRUCT_PATH.sub("", self._typeStr)
+
+    def __get(self, owner):
+        return owner.get_field(self._name) if isinstance(owner, UScriptStruct) else owner.get_property(self._name)
+
+    def __set(self, owner, value):
+        if isinstance(owner, UScriptStruct): owner.set_field(self._name, value)
+        else: owner.set_property(self._name, value)
+
+    def __inner(self):
+        return self._typeStr[self._typeStr.index("<") + 1:-1]
+
+    def set_length(self, owner, length : int):
+        struct = _find_struct(self.__inner())
+        self.__set(owner, [UScriptStruct(struct) for _ in range(length)])
+
+    def get_at_index(self, owner, index : int):
+        return self.__get(owner)[index]
+
+    def add_key_value(self, owner, key, value):
+        current = self.__get(owner) or {}
+        current[key] = value
+        self.__set(owner, current)
+
+    def add_key(self, owner, key):
+        value_type = self.__inner().split(",")[-1]
+        current = self.__get(owner) or {}
+        current[key] = UScriptStruct(_find_struct(value_type))
+        self.__set(owner, current)
+        return current[key]
+
+_STRUCT_PATH = re.compile(r":[^,>]*")
+
+def _find_struct(typeStr : str):
+    if ":" not in typeStr: return UStruct("GenericStruct", {})
+    return _objects[typeStr.split(":", 1)[1]]
+
+def _default_for_type(typeStr : str):
+    if typeStr.startswith(("ArrayProperty", "SetProperty")): return []
+    if typeStr.startswith("MapProperty"): return {}
+    if typeStr == "BoolProperty": return False
+    if typeStr in ("FloatProperty", "DoubleProperty"): return 0.0
+    if typeStr in ("StrProperty", "NameProperty", "TextProperty"): return ""
+    if typeStr.endswith("Property"): return 0 if typeStr != "ObjectProperty" else None
+    if typeStr.startswith("UScriptStruct:"):
+        return UScriptStruct(_find_struct(typeStr))
+    return None
+
+class _Vector:
+    def __init__(self, *args): self.args = args
+    def __repr__(self): return f"{type(self).__name__}{self.args}"
+
+class FVector(_Vector): pass
+class FVector2D(_Vector): pass
+class FRotator(_Vector): pass
+class FQuat(_Vector): pass
+class FTransform(_Vector): pass
+class FColor(_Vector): pass
+class FLinearColor(_Vector): pass
+class FHitResult(_Vector): pass
+
+class EdGraphPin:
+    def __init__(self, direction, pin_type, name : str):
+        self.direction = direction
+        self.pin_type = pin_type
+        self.name = name
+
+    def __repr__(self):
+        return "<unreal_engine.EdGraphPin {'name': '%s', 'type': '%s'}>" % (self.name, self.pin_type.PinCategory)
+
+class EdGraphNode(UObject):
+    def __init__(self, name : str, outer, clazz):
+        super().__init__(name, outer, clazz)
+        object.__setattr__(self, "_pins", [])
+        self.NodePosX = 0
+        self.NodePosY = 0
+
+    def node_create_pin(self, direction, pin_type, name : str):
+        pin = EdGraphPin(direction, pin_type, name)
+        self._pins.append(pin)
+        return pin
+
+    def node_pins(self): return list(self._pins)
+
+class EdGraph(UObject):
+    def __init__(self, name : str, outer = None):
+        super().__init__(name, outer, _classes["EdGraph"])
+        self.Nodes = []
+
+    def graph_add_node(self, clazz, x : int = 0, y : int = 0):
+        node = EdGraphNode(f"{clazz.get_name()}_{len(self.Nodes)}", self, clazz)
+        node.NodePosX, node.NodePosY = x, y
+        self.Nodes.append(node)
+        return node
+
+    def graph_add_node_custom_event(self, name : str, x : int = 0, y : int = 0):
+        node = self.graph_add_node(_classes["K2Node_CustomEvent"], x, y)
+        node.CustomFunctionName = name
+        return node
+
+    # Like the editor, looks at every node to find free space
+    def graph_get_good_place_for_new_node(self):
+        if len(self.Nodes) == 0: return (0, 0)
+        return (0, max(node.NodePosY for node in self.Nodes) + 200)
+
+    def graph_remove_node(self, node):
+        if node in self.Nodes: self.Nodes.remove(node)
+
+class Factory(UObject):
+    def __init__(self, clazz):
+        super().__init__(f"{clazz.get_name()}Factory", None, None)
+        object.__setattr__(self, "_asset_class", clazz)
+
+    def factory_create_new(self, path : str):
+        name = _short_name(path)
+        asset = UObject(name, None, self._asset_class, f"{path}.{name}")
+        if self._asset_class.get_name() == "WidgetBlueprint":
+            asset.WidgetTree = UObject("WidgetTree", asset, _classes["WidgetTree"])
+            asset.WidgetTree.AllWidgets = []
+            asset.WidgetTree.RootWidget = None
+        asset.FunctionGraphs = [EdGraph("UserConstructionScript", asset)]
+        asset.DelegateSignatureGraphs = []
+        asset.UbergraphPages = [EdGraph("EventGraph", asset)]
+        asset.NewVariables = []
+        asset.ParentClass = None
+        asset.GeneratedClass = None
+        object.__setattr__(asset, "_components", [])
+        _register(path, asset)
+        _register(f"{path}.{name}", asset)
+        return asset
+
+# ===== Module functions =====
+
+def find_class(name : str):
+    clazz = _classes.get(name) or _classes.get(_short_name(name))
+    if clazz is None: raise Exception(f"unable to find class {name}")
+    return clazz
+
+def find_object(name : str):
+    if not isinstance(name, str): raise Exception("argument is not a string")
+    obj = _objects.get(name)
+    if obj is None: raise Exception(f"unable to find object {name}")
+    return obj
+
+def load_object(clazz, name : str):
+    obj = _objects.get(name)
+    if obj is None: raise Exception(f"unable to find object {name}")
+    return obj
+
+def new_guid():
+    return uuid.UUID(int=next(_guids))
+
+def get_content_dir():
+    return os.path.join(os.getcwd(), "Content")
+
+def blueprint_add_function(bp, name : str):
+    graph = EdGraph(name, bp)
+    graph.graph_add_node(_classes["K2Node_FunctionEntry"])
+    bp.FunctionGraphs = bp.FunctionGraphs + [graph]
+    return graph
+
+def blueprint_add_event_dispatcher(bp, name : str):
+    graph = EdGraph(name, bp)
+    graph.graph_add_node(_classes["K2Node_FunctionEntry"])
+    bp.DelegateSignatureGraphs = bp.DelegateSignatureGraphs + [graph]
+    return graph
+
+def blueprint_mark_as_structurally_modified(bp): pass
+
+_PIN_CATEGORY_TYPES = {
+    "bool": "BoolProperty",
+    "int": "IntProperty",
+    "int64": "Int64Property",
+    "float": "FloatProperty",
+    "double": "DoubleProperty",
+    "real": "DoubleProperty",
+    "String": "StrProperty",
+    "name": "NameProperty",
+    "text": "TextProperty",
+    "byte": "ByteProperty",
+    "object": "ObjectProperty",
+    "class": "ObjectProperty",
+}
+
+def _type_str_for_pin(pin_type):
+    sub = getattr(pin_type, "PinSubCategoryObject", None)
+    if pin_type.PinCategory == "struct" and sub is not None:
+        inner = f"F{sub.get_name()}" if f"F{sub.get_name()}" in globals() else f"UScriptStruct:{sub.get_path_name()}"
+    else:
+        inner = _PIN_CATEGORY_TYPES.get(pin_type.PinCategory, "ObjectProperty")
+    container = getattr(pin_type, "ContainerType", None)
+    if container == EPinContainerType.Array: return f"ArrayProperty<{inner}>"
+    if container == EPinContainerType.Set: return f"SetProperty<{inner}>"
+    if container == EPinContainerType.Map: return f"MapProperty<{inner},{_PIN_CATEGORY_TYPES.get(pin_type.PinValueType.TerminalCategory, 'ObjectProperty')}>"
+    return inner
+
+def compile_blueprint(bp):
+    name = f"{bp.get_name()}_C"
+    package = bp.get_path_name().split(".")[0]
+    schema = {str(var.VarName): _type_str_for_pin(var.VarType) for var in bp.NewVariables}
+    for cmp in bp._components:
+        schema[cmp.get_name()[:-len("_GEN_VARIABLE")]] = "ObjectProperty"
+    clazz = UClass(name, schema, bp.ParentClass, f"{package}.{name}")
+    bp.GeneratedClass = clazz
+    _register(f"{package}.{name}", clazz)
+    default_object = UObject(f"Default__{name}", None, clazz, f"{package}.Default__{name}")
+    _register(f"{package}.Default__{name}", default_object)
+
+# Component templates are named after the SCS variable with a _GEN_VARIABLE suffix
+def add_component_to_blueprint(bp, clazz, name : str):
+    cmp = UObject(f"{name}_GEN_VARIABLE", bp, clazz)
+    bp._components.append(cmp)
+    return cmp
+
+def remove_component_from_blueprint(bp, name : str):
+    object.__setattr__(bp, "_components", [
+        cmp for cmp in bp._components if cmp.get_name() != name
+    ])
+
+def get_blueprint_components(bp):
+    return list(bp._components)
+
+# ===== Type registration (not part of the real API) =====
+
+def register_class(name : str, schema : dict = None, parent : str = None):
+    clazz = UClass(name, schema, _classes.get(parent) if parent else None)
+    _classes[name] = clazz
+    _register(clazz.get_path_name(), clazz)
+    return clazz
+
+def register_struct(name : str, fields : dict):
+    struct = UStruct(name, fields)
+    _register(struct.get_path_name(), struct)
+    return struct
+
+def register_enum(name : str, values):
+    enum = UObject(name, None, None, f"/Script/Engine.{name}")
+    enum._props["__enum_names"] = ("__enum_names", list(values))
+    _register(enum.get_path_name(), enum)
+    return enum
+
+_BUILTIN_CLASSES = (
+    "Object", "Class", "Blueprint", "WidgetBlueprint", "WidgetTree", "EdGraph",
+    "K2Node_FunctionEntry", "K2Node_FunctionResult", "K2Node_Event", "K2Node_CustomEvent",
+    "Actor", "ActorComponent", "SceneComponent",
+)
+
+def _register_builtins():
+    for name in _BUILTIN_CLASSES:
+        register_class(name)
+
+_register_builtins()
+
+from unreal_engine.enums import EPinContainerType
+
+# ===== API coverage =====
+
+_INFO_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "Info")
+
+# Members used by the converters that were bound after the Info dumps were recorded
+UNRECORDED_MEMBERS = (
+    "get_fproperty", "get_type_str", "set_length", "get_at_index", "add_key_value", "add_key",
+    "fields", "get_field", "set_field", "get_struct",
+)
+
+def _read_members(file_name : str):
+    with open(os.path.join(_INFO_DIR, file_name), "r") as fp:
+        return set(line.strip() for line in fp if line.strip() != "")
+
+# Returns the public members of the stand-in that the real module and UObject don't have
+def check_recorded_members():
+    module_members = _read_members("UEMembers.txt")
+    object_members = _read_members("BPMembers.txt") | _read_members("PinMembers.txt")
+    missing = []
+    for name in (
+        "find_class", "find_object", "load_object", "new_guid", "get_content_dir",
+        "blueprint_add_function", "blueprint_add_event_dispatcher", "blueprint_mark_as_structurally_modified",
+        "compile_blueprint", "add_component_to_blueprint", "remove_component_from_blueprint", "get_blueprint_components",
+        "UObject", "UScriptStruct", "EdGraphPin", "FVector", "FVector2D", "FRotator", "FQuat", "FTransform",
+        "FColor", "FLinearColor", "FHitResult",
+    ):
+        if name not in module_members: missing.append(name)
+    for clazz in (UObject, EdGraph, EdGraphNode, Factory, UScriptStruct, FProperty):
+        for name in vars(clazz):
+            if name.startswith("_") or name in UNRECORDED_MEMBERS: continue
+            if name not in object_members: missing.append(f"{clazz.__name__}.{name}")
+    return missing
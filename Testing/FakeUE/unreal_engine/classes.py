@@ -0,0 +1,12 @@
+import unreal_engine as ue
+
+def BlueprintFactory(): return ue.Factory(ue.find_class("Blueprint"))
+def WidgetBlueprintFactory(): return ue.Factory(ue.find_class("WidgetBlueprint"))
+
+# Any other class is looked up in the registered classes
+def __getattr__(name):
+    if name.startswith("__"): raise AttributeError(name)
+    try:
+        return ue.find_class(name)
+    except Exception:
+        raise AttributeError(name)
@@ -0,0 +1,6 @@
+class _Enum:
+    def __init__(self, **values):
+        for key, value in values.items(): setattr(self, key, value)
+
+EPinContainerType = _Enum(None_=0, Array=1, Set=2, Map=3)
+EEdGraphPinDirection = _Enum(EGPD_Input=0, EGPD_Output=1)
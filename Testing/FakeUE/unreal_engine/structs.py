@@ -0,0 +1,9 @@
+class _Struct:
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items(): setattr(self, key, value)
+
+    def as_dict(self): return dict(vars(self))
+
+class EdGraphPinType(_Struct): pass
+class EdGraphTerminalType(_Struct): pass
+class BPVariableDescription(_Struct): pass
@@ -0,0 +1,238 @@
+import os
+import re
+import time
+import traceback
+
+import LoggingUtil
+import ProfilingUtil
+import Tools.FModel as FTools
+import Tools.Dependencies as Dependencies
+from Tools.Manifest import Manifest
+
+BLUEPRINT = "BlueprintGeneratedClass"
+WIDGET = "WidgetBlueprintGeneratedClass"
+# Blueprint already planned by Tools.Plan
+PLAN = "Plan"
+
+# Cheap check on the raw file so exports that aren't blueprints are never parsed
+_ROOT_TYPE = re.compile(rb'"Type":\s*"(' + WIDGET.encode() + rb'|' + BLUEPRINT.encode() + rb')"')
+
+def get_package(ref):
+    if not isinstance(ref, dict) or "ObjectPath" not in ref: return None
+    return FTools.split_object_path(ref["ObjectPath"])[0]
+
+def sniff_export_kind(data : bytes):
+    m = _ROOT_TYPE.search(data)
+    if m is None: return None
+    return m.group(1).decode()
+
+# data is the raw file when the caller already read it for sniff_export_kind
+def read_export(path : str, kind : str, data : bytes = None):
+    if data is None:
+        with open(path, "rb") as fp: data = fp.read()
+    fmodel = FTools.FModelJson(path, streaming=True)
+    try:
+        root = fmodel.get_first_of_key("Type", kind)
+        if root is None: return None
+        package = get_package(root.get("ClassDefaultObject"))
+    finally:
+        fmodel.close()
+    if package is None: return None
+    return {
+        "Path": path,
+        "Kind": kind,
+        "Package": package,
+        "Dependencies": Dependencies.find_references(data, package),
+    }
+
+# With a Tools.Catalog.Catalog the catalog is refreshed and answers instead of reading every file
+def discover_exports(root_dir : str, catalog = None):
+    if catalog is not None:
+        catalog.refresh(root_dir)
+        return catalog.get_exports()
+    exports = []
+    for dir_path, _, files in os.walk(root_dir):
+        for file_name in sorted(files):
+            if not file_name.lower().endswith(".json"): continue
+            path = os.path.join(dir_path, file_name)
+            with open(path, "rb") as fp: data = fp.read()
+            kind = sniff_export_kind(data)
+            if kind is None: continue
+            # A malformed export is reported and left out rather than stopping discovery of the rest
+            try:
+                export = read_export(path, kind, data)
+            except ValueError as e:
+                LoggingUtil.log(f"Unreadable export {path}: {e}", level=LoggingUtil.WARNING, outcome="unreadable")
+                continue
+            if export is not None: exports.append(export)
+    return exports
+
+def discover_plans(plan_dir : str):
+    import Tools.Plan as Plan
+    plans = []
+    for dir_path, _, files in os.walk(plan_dir):
+        for file_name in sorted(files):
+            if not file_name.endswith(".plan.json"): continue
+            path = os.path.join(dir_path, file_name)
+            plan = Plan.load_plan(path)
+            plans.append({
+                "Path": path,
+                "Kind": PLAN,
+                "Package": plan["Package"],
+                "Dependencies": Dependencies.scan_references(path, plan["Package"]),
+            })
+    return plans
+
+# Dependencies inside the batch are generated first, cycles are logged and generated together
+def order_by_dependency(exports : list):
+    by_package = {export["Package"]: export for export in exports}
+    graph = Dependencies.DependencyGraph.from_exports(exports)
+    for cycle in graph.find_cycles():
+        LoggingUtil.log(f"Dependency cycle: {', '.join(cycle)}", level=LoggingUtil.WARNING)
+    return [by_package[package] for package in graph.schedule()]
+
+# Returns the fingerprint of the applied plan for Blueprints, previous_fingerprint enables a diff based update
+# Widgets use their plan from widget_plans when present and are appended to compile_queue instead of compiled when given
+# Blueprint exports come from loader (an FTools.PrefetchLoader) when given
+def convert_export(export : dict, previous_fingerprint : dict = None, widget_plans : dict = None, compile_queue : list = None,
+                   loader : FTools.PrefetchLoader = None):
+    if export["Kind"] in (BLUEPRINT, PLAN):
+        import Tools.Blueprint as BPGenerator
+        import Tools.Plan as Plan
+        if export["Kind"] == BLUEPRINT:
+            fmodel = loader.get(export["Path"]) if loader is not None else FTools.FModelJson(export["Path"])
+            plan = Plan.plan_blueprint(fmodel, export["Path"])
+        else:
+            plan = Plan.load_plan(export["Path"])
+        BPGenerator.apply_plan(plan, previous_fingerprint)
+        return Plan.fingerprint_plan(plan)
+    elif export["Kind"] == WIDGET:
+        import WidgetUtil
+        import Tools.Widget as Widget
+        plan = widget_plans.get(export["Path"]) if widget_plans is not None else None
+        if plan is None: plan = Widget.plan_widget_file(export["Path"])
+        widget = WidgetUtil.apply_plan(plan, export["Package"], compile=compile_queue is None)
+        if compile_queue is not None: compile_queue.append(widget)
+    return None
+
+# With a manifest path, assets whose source, generator version and dependencies are unchanged are skipped
+# With a catalog path, discovery and find_object fallbacks use a Tools.Catalog kept next to it
+def run(root_dir : str, kinds = (BLUEPRINT, WIDGET), manifest_path : str = None, widget_workers : int = None,
+        catalog_path : str = None, prefetch_depth : int = FTools.PREFETCH_DEPTH):
+    start = time.perf_counter()
+    catalog = None
+    if catalog_path is not None:
+        import Tools.Catalog as Catalog
+        import Tools.UE as UETools
+        catalog = Catalog.Catalog(catalog_path, root_dir)
+    try:
+        exports = [x for x in discover_exports(root_dir, catalog) if x["Kind"] in kinds]
+        if catalog is not None: UETools.set_catalog(catalog)
+        return convert_all(exports, start, manifest_path, widget_workers, prefetch_depth)
+    finally:
+        if catalog is not None:
+            UETools.set_catalog(None)
+            catalog.close()
+
+# Applies plans written by "python -m Tools.Plan" instead of parsing exports in the editor
+def run_plans(plan_dir : str, manifest_path : str = None):
+    start = time.perf_counter()
+    return convert_all(discover_plans(plan_dir), start, manifest_path)
+
+# Manifest is saved every this many converted assets so an aborted run keeps its progress
+MANIFEST_SAVE_INTERVAL = 50
+
+# Widget exports that need converting are parsed and planned concurrently up front, their assets are compiled together after the loop
+# Blueprint exports are loaded up to prefetch_depth ahead on a background thread, 0 loads each when it is converted
+def convert_all(exports : list, start : float, manifest_path : str = None, widget_workers : int = None,
+                prefetch_depth : int = FTools.PREFETCH_DEPTH):
+    discovered = time.perf_counter()
+    exports = order_by_dependency(exports)
+    manifest = Manifest(manifest_path) if manifest_path is not None else None
+
+    # Hashes of assets in this run, so dependents see the new hash of a regenerated dependency
+    # Decided before anything is loaded so up to date exports are never read
+    asset_hashes = {}
+    up_to_date = set()
+    if manifest is not None:
+        for export in exports:
+            asset_hash = manifest.compute_hash(export["Path"], export["Dependencies"], asset_hashes)
+            asset_hashes[export["Package"]] = asset_hash
+            if manifest.is_up_to_date(export["Package"], asset_hash): up_to_date.add(export["Package"])
+    pending = [export for export in exports if export["Package"] not in up_to_date]
+
+    widget_plans = None
+    compile_queue = []
+    widget_paths = [export["Path"] for export in pending if export["Kind"] == WIDGET]
+    if len(widget_paths) > 0:
+        import Tools.Widget as Widget
+        # Failed plans are retried in the loop so the error is logged against the asset
+        widget_plans, _ = Widget.plan_widget_files(widget_paths, widget_workers)
+
+    loader = None
+    blueprint_paths = [export["Path"] for export in pending if export["Kind"] == BLUEPRINT]
+    if prefetch_depth > 0 and len(blueprint_paths) > 0:
+        loader = FTools.PrefetchLoader(blueprint_paths, prefetch_depth)
+
+    converted = []
+    skipped = []
+    failed = []
+    try:
+        for i, export in enumerate(exports):
+            LoggingUtil.reset()
+            LoggingUtil.header(f"[{i + 1}/{len(exports)}] {export['Package']}")
+            ProfilingUtil.set_asset(export["Package"])
+            LoggingUtil.set_context(asset=export["Package"])
+
+            if export["Package"] in up_to_date:
+                LoggingUtil.log("Up to date")
+                skipped.append(export["Package"])
+                LoggingUtil.reset()
+                continue
+
+            try:
+                previous_fingerprint = manifest.get_fingerprint(export["Package"]) if manifest is not None else None
+                fingerprint = convert_export(export, previous_fingerprint, widget_plans, compile_queue, loader)
+                converted.append(export["Package"])
+                if manifest is not None:
+                    manifest.update(export["Package"], asset_hashes[export["Package"]], export["Path"], fingerprint)
+                    if len(converted) % MANIFEST_SAVE_INTERVAL == 0: manifest.save()
+            except Exception:
+                LoggingUtil.log(traceback.format_exc(), level=LoggingUtil.ERROR, outcome="failed")
+                failed.append(export["Package"])
+                if manifest is not None: manifest.remove(export["Package"])
+            LoggingUtil.reset()
+    finally:
+        if loader is not None: loader.close()
+
+    if len(compile_queue) > 0:
+        import WidgetUtil
+        WidgetUtil.compile_all(compile_queue)
+
+    if manifest is not None: manifest.save()
+    ProfilingUtil.set_asset("")
+    LoggingUtil.set_context(asset=None)
+    LoggingUtil.flush()
+
+    end = time.perf_counter()
+    report = {
+        "Discovered": len(exports),
+        "Converted": len(converted),
+        "Skipped": len(skipped),
+        "Failed": failed,
+        "DiscoverySeconds": discovered - start,
+        "ConversionSeconds": end - discovered,
+        "AssetsPerSecond": len(converted) / (end - discovered) if end > discovered else 0.0,
+    }
+    log_report(report)
+    if ProfilingUtil.enabled: ProfilingUtil.log_report()
+    return report
+
+def log_report(report : dict):
+    LoggingUtil.header("Batch Report")
+    LoggingUtil.log(f"Converted {report['Converted']}/{report['Discovered']} assets ({report['Skipped']} up to date)")
+    LoggingUtil.log(f"Discovery: {report['DiscoverySeconds']:.2f}s")
+    LoggingUtil.log(f"Conversion: {report['ConversionSeconds']:.2f}s ({report['AssetsPerSecond']:.2f} assets/s)")
+    for package in report["Failed"]:
+        LoggingUtil.log(f"FAILED: {package}")
+    LoggingUtil.undent()
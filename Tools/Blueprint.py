@@ -1,97 +1,189 @@
+# Engine classes, structs and enums are looked up on first use, see UETools.get_engine_types
 import unreal_engine as ue
-from unreal_engine.classes import BlueprintFactory, Blueprint, K2Node_FunctionResult, K2Node_Event, K2Node_CustomEvent
-from unreal_engine.structs import EdGraphPinType, BPVariableDescription, EdGraphTerminalType
-from unreal_engine.enums import EEdGraphPinDirection, EPinContainerType
+
+from contextlib import contextmanager
 
 import Tools.UE as UETools
 import Tools.FModel
+import Tools.Plan as Plan
+import Tools.Layout as Layout
 
 import LoggingUtil
+import ProfilingUtil
+
+def resolve_components(planned_components):
+    return [
+        dict(cmp, Class=UETools.find_object(cmp["Class"])) for cmp in planned_components
+    ]
 
 def get_generated_components(fmodel : Tools.FModel.FModelJson):
-    cmps = []
-    for scs_node in fmodel.get_all_of_key("Type", "SCS_Node"):
-        props = scs_node["Properties"]
-        if props["ComponentClass"]["ObjectName"] == "Class'SceneComponent'": continue
-        cmp_type = props["ComponentClass"]["ObjectName"][:-1].split("'")[-1]
-        var_name = props["InternalVariableName"]
-        prop_name = props["ComponentTemplate"]["ObjectName"].split(":")[-1][:-1]
-        cmps.append({
-            "Type": cmp_type,
-            "VarName": var_name,
-            "RealName": prop_name,
-            "Class": UETools.find_object(props["ComponentClass"])
-        })
-
-    return cmps
+    return resolve_components(Plan.plan_generated_components(fmodel))
 
 
 def get_parent_components(fmodel : Tools.FModel.FModelJson):
-    cmps = []
-    root = fmodel.get_first_of_key("Type", "BlueprintGeneratedClass")
-    default_node = fmodel.get_first_of_key("Type", root["Name"])
-    default_name = default_node["Name"]
-    defaults = default_node.get("Properties", {})
-
-    def is_json_component(json_value):
-        if not isinstance(json_value, dict): return False
-        if ("ObjectName" not in json_value) or ("ObjectPath" not in json_value): return False
-        return f"'{default_name}:" in json_value["ObjectName"]
-
-    for key in [k for k in defaults if is_json_component(defaults[k])]:
-        v = defaults[key]
-
-        cmps.append({
-            "VarName": v["ObjectName"].split(":")[-1][:-1],
-            "RealName": key,
-        })
-
-    return cmps
+    return Plan.plan_parent_components(fmodel)
+
+# SCS templates are named after the component variable with this suffix
+TEMPLATE_SUFFIX = "_GEN_VARIABLE"
+
+def get_template_var_name(template_name : str):
+    return template_name[:-len(TEMPLATE_SUFFIX)] if template_name.endswith(TEMPLATE_SUFFIX) else template_name
+
+class ComponentRegistry():
+    """
+    Planned components of a Blueprint indexed by VarName, RealName and node name, plus the engine templates of the generated ones.
+    Generated components are added by this Blueprint's SCS, parent components are inherited and only have defaults set.
+    """
+    generated = []
+    parent = []
+
+    def __init__(self, generated_components, parent_components):
+        self.generated = list(generated_components)
+        self.parent = list(parent_components)
+        self.generated_by_var_name = {cmp["VarName"]: cmp for cmp in self.generated}
+        self.parent_by_real_name = {cmp["RealName"]: cmp for cmp in self.parent}
+        self.parent_by_var_name = {cmp["VarName"]: cmp for cmp in self.parent}
+        # Template name ("<VarName>_GEN_VARIABLE") -> template, None until read from the Blueprint
+        self.templates = None
+        # VarName -> template name, the name the engine binds components by
+        self.template_names = None
+
+    def is_generated(self, var_name : str): return var_name in self.generated_by_var_name
+
+    def is_parent_real_name(self, real_name : str): return real_name in self.parent_by_real_name
+
+    def get_parent_by_node_name(self, name : str): return self.parent_by_var_name.get(name)
+
+    # Node names used as keys of the plan's ComponentProperties
+    def node_names(self):
+        return [cmp["RealName"] for cmp in self.generated] + [cmp["VarName"] for cmp in self.parent]
+
+    def load_templates(self, bp):
+        self.templates = {cmp.get_name(): cmp for cmp in ue.get_blueprint_components(bp)}
+        self.template_names = {get_template_var_name(name): name for name in self.templates}
+
+    def get_template_names(self, bp):
+        if self.templates is None: self.load_templates(bp)
+        return self.template_names
+
+    def get_template(self, bp, name : str):
+        if self.templates is None: self.load_templates(bp)
+        return self.templates.get(name)
+
+    def add_template(self, template):
+        if self.templates is not None and template is not None:
+            self.templates[template.get_name()] = template
+            self.template_names[get_template_var_name(template.get_name())] = template.get_name()
+
+    def remove_template(self, var_name : str):
+        if self.templates is None: return
+        name = self.template_names.pop(var_name, None)
+        if name is not None: self.templates.pop(name, None)
+
+    # All templates were removed from the Blueprint
+    def clear_templates(self):
+        self.templates = {}
+        self.template_names = {}
 
 class BPGenerator():
     path = ""
-    bp : Blueprint = None
+    bp = None
+    # True when the Blueprint asset didn't exist before this generator
+    created = False
+    # Compiles requested inside deferred_compile() are coalesced into one
+    defer_compile_depth = 0
+    needs_compile = False
+    compiles_run = 0
+    compiles_avoided = 0
     default_object = None
     bp_vars = []
-    generated_components = []
-    parent_components = []
+    components : ComponentRegistry = None
+    # Packs custom events into the EventGraph, positions of planned events are taken from event_positions
+    event_layout : Layout.ColumnLayout = None
+    event_positions = {}
 
     fmodel : Tools.FModel.FModelJson
 
-    def __init__(self, path : str, fmodel : Tools.FModel.FModelJson):
+    # Components come from the plan when given, otherwise they are planned from the fmodel
+    def __init__(self, path : str, fmodel : Tools.FModel.FModelJson = None, plan : dict = None):
         self.fmodel = fmodel
         self.path = path
+        self.bp_vars = []
+        self.event_layout = None
+        self.event_positions = {}
+        self.created = False
+        from unreal_engine.classes import BlueprintFactory, Blueprint
         try:
             self.bp = ue.load_object(Blueprint, path)
         except:
             self.bp = BlueprintFactory().factory_create_new(path)
+            self.created = True
+            UETools.invalidate_object_cache(path)
 
-        self.generated_components = get_generated_components(self.fmodel)
-        self.parent_components = get_parent_components(self.fmodel)
+        if plan is None:
+            self.components = ComponentRegistry(get_generated_components(self.fmodel), get_parent_components(self.fmodel))
+        else:
+            self.components = ComponentRegistry(resolve_components(plan["Components"]), plan["ParentComponents"])
         self.modify()
 
+    @property
+    def generated_components(self): return self.components.generated
+
+    @property
+    def parent_components(self): return self.components.parent
+
     def is_var_component(self, var_name : str):
-        for cmp in self.generated_components:
-            if cmp["VarName"] == var_name: return True
-        return False
+        return self.components.is_generated(var_name)
 
     def is_real_var_parent_component(self, real_var_name : str):
-        for cmp in self.parent_components:
-            if cmp["RealName"] == real_var_name: return True
-        return False
+        return self.components.is_parent_real_name(real_var_name)
 
     def modify(self):
         self.bp.modify()
 
     def compile(self):
+        if self.defer_compile_depth > 0:
+            if self.needs_compile: self.compiles_avoided += 1
+            self.needs_compile = True
+            return
+        self.force_compile()
+
+    @ProfilingUtil.timed("blueprint.compile")
+    def force_compile(self):
         ue.blueprint_mark_as_structurally_modified(self.bp)
         self.bp.post_edit_change()
         ue.compile_blueprint(self.bp)
+        self.needs_compile = False
+        self.compiles_run += 1
+        # The generated class may have been recreated
+        UETools.invalidate_object_cache(self.path)
+        UETools.clear_setter_cache(self.path)
 
     def recompile(self):
         self.compile()
         self.modify()
 
+    # Runs a compile requested while deferred, if any
+    def flush_compile(self):
+        if self.needs_compile:
+            self.force_compile()
+            self.modify()
+
+    # Structural edits inside the block request compiles that only run once, when the generated class
+    # is needed (load_defaults) or when the outermost block exits
+    @contextmanager
+    def deferred_compile(self):
+        self.defer_compile_depth += 1
+        try:
+            yield self
+        finally:
+            self.defer_compile_depth -= 1
+        if self.defer_compile_depth == 0: self.flush_compile()
+
+    def log_compile_stats(self):
+        LoggingUtil.log(f"Compiled {self.compiles_run} time(s), {self.compiles_avoided} compile(s) avoided")
+
+    @ProfilingUtil.timed("blueprint.clear")
     def clear(self):
         # Clear all functions
         self.bp.FunctionGraphs = [
@@ -105,22 +197,27 @@ class BPGenerator():
             page for page in self.bp.UbergraphPages if page.get_name() == "EventGraph"
         ]
 
-        for node in self.bp.UberGraphPages[0].Nodes:
+        for node in list(self.bp.UberGraphPages[0].Nodes):
             self.bp.UberGraphPages[0].graph_remove_node(node)
+        self.event_layout = None
+        self.event_positions = {}
 
         # Clear existing variables
         self.bp.NewVariables = []
 
         for cmp in ue.get_blueprint_components(self.bp):
             ue.remove_component_from_blueprint(self.bp, cmp.get_name())
+        self.components.clear_templates()
 
         self.recompile()
 
+    @ProfilingUtil.timed("blueprint.variables")
     def apply_variables(self):
         self.bp.NewVariables = self.bp_vars
         self.recompile()
         self.bp_vars = self.bp.NewVariables
 
+    @ProfilingUtil.timed("blueprint.set_parent")
     def set_parent(self, clz):
         self.bp.ParentClass = clz
         self.recompile()
@@ -164,65 +261,93 @@ class BPGenerator():
             LoggingUtil.undent()
         LoggingUtil.log("===")
 
+    # Function nodes can be raw FModel nodes or already planned by Plan.plan_function
+    @ProfilingUtil.timed("blueprint.add_function")
     def add_function(self, node):
+        engine = UETools.get_engine_types()
+        EEdGraphPinDirection = engine.EEdGraphPinDirection
+        if "Params" not in node: node = Plan.plan_function(node)
         graph = ue.blueprint_add_function(self.bp, node["Name"])
         root = graph.Nodes[0]
 
         funcFlags = UETools.FunctionFlags(node["FunctionFlags"])
 
         if UETools.FunctionFlags.FUNC_HasOutParms in funcFlags:
-            output = graph.graph_add_node(K2Node_FunctionResult, 300, 0)
+            x, y = Layout.get_function_result_position((root.NodePosX, root.NodePosY))
+            output = graph.graph_add_node(engine.K2Node_FunctionResult, x, y)
 
         root.ExtraFlags = funcFlags
 
-        for prop in node.get("ChildProperties", []):
-            flags = UETools.PropertyFlags(prop.get("PropertyFlags", 0))
-
-            if UETools.PropertyFlags.CPF_Parm in flags:
-                target = output if UETools.PropertyFlags.CPF_OutParm in flags else root
-                direction = EEdGraphPinDirection.EGPD_Output if UETools.PropertyFlags.CPF_OutParm in flags else EEdGraphPinDirection.EGPD_Input
-                target.node_create_pin(direction, UETools.create_pin_type(prop), prop["Name"])
+        for param in node["Params"]:
+            flags = UETools.PropertyFlags(param["PropertyFlags"])
+            target = output if UETools.PropertyFlags.CPF_OutParm in flags else root
+            direction = EEdGraphPinDirection.EGPD_Output if UETools.PropertyFlags.CPF_OutParm in flags else EEdGraphPinDirection.EGPD_Input
+            target.node_create_pin(direction, UETools.create_pin_type_from_plan(param["PinType"]), param["Name"])
 
+    @ProfilingUtil.timed("blueprint.add_event")
     def add_event(self, node):
+        EEdGraphPinDirection = UETools.get_engine_types().EEdGraphPinDirection
+        if "Params" not in node: node = Plan.plan_function(node)
         # Ignore Overrides
-        if "SuperStruct" in node: return
+        if node["Override"]: return
 
         graph = self.bp.UberGraphPages[0]
-        x, y = graph.graph_get_good_place_for_new_node()
-        root = graph.graph_add_node_custom_event(node["Name"], x, y)
+        position = self.event_positions.pop(node["Name"], None)
+        if position is None:
+            position = self.get_event_layout().place(Layout.get_node_height(len(node["Params"])))
+        root = graph.graph_add_node_custom_event(node["Name"], *position)
 
-        for prop in node.get("ChildProperties", []):
-            flags = UETools.PropertyFlags(prop.get("PropertyFlags", 0))
-            if UETools.PropertyFlags.CPF_Parm in flags:
-                root.node_create_pin(
-                    EEdGraphPinDirection.EGPD_Input,
-                    UETools.create_pin_type(prop),
-                    prop["Name"]
-                )
+        for param in node["Params"]:
+            root.node_create_pin(
+                EEdGraphPinDirection.EGPD_Input,
+                UETools.create_pin_type_from_plan(param["PinType"]),
+                param["Name"]
+            )
 
 
     # An event delegate is just a function but in its own graph in "DelegateSignatureGraphs"
+    @ProfilingUtil.timed("blueprint.add_event_delegate")
     def add_event_delegate(self, node):
+        EEdGraphPinDirection = UETools.get_engine_types().EEdGraphPinDirection
+        if "Params" not in node: node = Plan.plan_function(node)
         graph = ue.blueprint_add_event_dispatcher(self.bp, node["Name"][:-len("__DelegateSignature")])
         root = graph.Nodes[0]
         
         root.FunctionFlags = UETools.FunctionFlags(node["FunctionFlags"])
 
-        for prop in node.get("ChildProperties", []):
-            flags = UETools.PropertyFlags(prop.get("PropertyFlags", 0))
-
-            if UETools.PropertyFlags.CPF_Parm in flags:
-                root.node_create_pin(EEdGraphPinDirection.EGPD_Input, UETools.create_pin_type(prop), prop["Name"])
-
+        for param in node["Params"]:
+            root.node_create_pin(EEdGraphPinDirection.EGPD_Input, UETools.create_pin_type_from_plan(param["PinType"]), param["Name"])
+
+    # New events go below the nodes already in the EventGraph, found once instead of per event
+    def get_event_layout(self):
+        if self.event_layout is None:
+            nodes = self.bp.UberGraphPages[0].Nodes
+            self.event_layout = Layout.ColumnLayout(Layout.get_free_origin((node.NodePosX, node.NodePosY) for node in nodes))
+        return self.event_layout
+
+    # Positions every event of functions up front so they are placed in one pass
+    def layout_events(self, functions):
+        self.event_positions.update(Layout.plan_event_layout(functions, self.get_event_layout()))
+
+    def add_planned_function(self, node):
+        if node["Kind"] == Plan.DELEGATE:
+            self.add_event_delegate(node)
+        elif node["Kind"] == Plan.EVENT:
+            self.add_event(node)
+        elif node["Kind"] == Plan.FUNCTION:
+            self.add_function(node)
+
+    # Variables can be raw FModel properties or already planned by Plan.plan_variable
     def add_var(self, var):
-        if var.get("Name") in ["DefaultSceneRoot", "UberGraphFrame"]: return
-        if var.get("Type") in ["MulticastInlineDelegateProperty"]: return
-        if self.is_var_component(var.get("Name")): return
-        varType = UETools.create_pin_type(var)
+        BPVariableDescription = UETools.get_engine_types().BPVariableDescription
+        if "PinType" not in var:
+            var = Plan.plan_variable(var, ())
+            if var is None: return
+        if self.is_var_component(var["Name"]): return
         self.bp_vars.append(BPVariableDescription(
             VarName=var["Name"],
-            VarType=varType,
-            PropertyFlags=UETools.PropertyFlags(var.get("PropertyFlags", 0)),
+            VarType=UETools.create_pin_type_from_plan(var["PinType"]),
+            PropertyFlags=UETools.PropertyFlags(var["PropertyFlags"]),
             ReplicationCondition=0,
             DefaultValue="",
             VarGuid=ue.new_guid()
@@ -233,58 +358,199 @@ class BPGenerator():
             self.add_var(var)
         self.apply_variables()
 
+    def add_component(self, item):
+        self.components.add_template(ue.add_component_to_blueprint(self.bp, item["Class"], item["VarName"]))
+
+    @ProfilingUtil.timed("blueprint.add_components")
     def add_components(self):
         for item in self.generated_components:
-            ue.add_component_to_blueprint(self.bp, item["Class"], item["VarName"])
+            self.add_component(item)
+
+    def get_existing_variable_names(self):
+        return set(str(var.VarName) for var in self.bp.NewVariables)
+
+    def get_existing_function_names(self):
+        names = set(func.get_name() for func in self.bp.FunctionGraphs)
+        names |= set(graph.get_name() + "__DelegateSignature" for graph in self.bp.DelegateSignatureGraphs)
+        for page in self.bp.UbergraphPages:
+            names |= set(str(node.CustomFunctionName) for node in UETools.get_event_nodes(page))
+        return names
+
+    # VarName -> template name of the components in the Blueprint
+    def get_existing_component_names(self):
+        return dict(self.components.get_template_names(self.bp))
+
+    # Removes a function, event or dispatcher with the given (FModel) name
+    def remove_function(self, name : str):
+        self.bp.FunctionGraphs = [
+            func for func in self.bp.FunctionGraphs if func.get_name() != name
+        ]
+        self.bp.DelegateSignatureGraphs = [
+            graph for graph in self.bp.DelegateSignatureGraphs if graph.get_name() + "__DelegateSignature" != name
+        ]
+        for page in self.bp.UbergraphPages:
+            for node in UETools.get_event_nodes(page):
+                if str(node.CustomFunctionName) == name: page.graph_remove_node(node)
+
+    # Brings an existing Blueprint in line with plan, only touching items that differ from the previous plan's fingerprint.
+    # Items that are unchanged but missing from the Blueprint are recreated
+    @ProfilingUtil.timed("blueprint.update")
+    def update(self, plan : dict, previous_fingerprint : dict):
+        fingerprint = Plan.fingerprint_plan(plan)
+
+        if fingerprint["Parent"] != previous_fingerprint.get("Parent"):
+            self.set_parent(UETools.find_object(plan["Parent"]))
+
+        diff = Plan.diff_fingerprints(previous_fingerprint, fingerprint, "Variables")
+        existing = self.get_existing_variable_names()
+        stale = set(diff["Remove"] + diff["Modify"])
+        wanted = set(diff["Add"] + diff["Modify"]) | set(name for name in fingerprint["Variables"] if name not in existing)
+        if len(stale) > 0 or len(wanted) > 0:
+            LoggingUtil.log(f"Variables: +{len(wanted)} -{len(stale)}")
+            self.bp_vars = [var for var in self.bp.NewVariables if str(var.VarName) not in (stale | wanted)]
+            for var in plan["Variables"]:
+                if var["Name"] in wanted: self.add_var(var)
+            self.apply_variables()
+
+        diff = Plan.diff_fingerprints(previous_fingerprint, fingerprint, "Functions")
+        existing = self.get_existing_function_names()
+        stale = set(diff["Remove"] + diff["Modify"])
+        wanted = set(diff["Add"] + diff["Modify"]) | set(
+            func["Name"] for func in plan["Functions"]
+            if func["Name"] not in existing and not (func["Kind"] == Plan.EVENT and func["Override"])
+        )
+        if len(stale) > 0 or len(wanted) > 0:
+            LoggingUtil.log(f"Functions: +{len(wanted)} -{len(stale)}")
+        for name in stale | wanted:
+            self.remove_function(name)
+        added = [func for func in plan["Functions"] if func["Name"] in wanted]
+        self.layout_events(added)
+        for func in added:
+            self.add_planned_function(func)
+
+        diff = Plan.diff_fingerprints(previous_fingerprint, fingerprint, "Components")
+        existing = self.get_existing_component_names()
+        stale = set(diff["Remove"] + diff["Modify"])
+        wanted = set(diff["Add"] + diff["Modify"]) | set(name for name in fingerprint["Components"] if name not in existing)
+        if len(stale) > 0 or len(wanted) > 0:
+            LoggingUtil.log(f"Components: +{len(wanted)} -{len(stale)}")
+        for name in stale | wanted:
+            if name in existing:
+                ue.remove_component_from_blueprint(self.bp, existing[name])
+                self.components.remove_template(name)
+        for item in self.generated_components:
+            if item["VarName"] in wanted: self.add_component(item)
+
+        return fingerprint
 
 
+    @ProfilingUtil.timed("blueprint.load_defaults")
     def load_defaults(self):
+        if self.needs_compile or self.bp.GeneratedClass is None:
+            self.force_compile()
+            self.modify()
         generated_class = self.bp.GeneratedClass
-        print("DEFAULTS")
-        print(generated_class)
+        LoggingUtil.log("DEFAULTS", level=LoggingUtil.DEBUG)
+        LoggingUtil.log(generated_class, level=LoggingUtil.DEBUG)
         self.default_object = ue.load_object(
             generated_class,
             self.path + ".Default__" + generated_class.get_name()
         )
-        print(self.default_object)
+        LoggingUtil.log(self.default_object, level=LoggingUtil.DEBUG)
 
+    @ProfilingUtil.timed("blueprint.set_default_value")
     def set_default_value(self, key, json_value):
         if self.default_object is None: return True
         if key == "UberGraphFrame": return True
         if self.is_real_var_parent_component(key): return True
         if key not in self.default_object.properties():
-            LoggingUtil.log(f"ERROR: No matching key ({key}) in default")
+            LoggingUtil.log(f"ERROR: No matching key ({key}) in default", level=LoggingUtil.ERROR, property=key, outcome="missing")
             return True
 
         return UETools.set_property(self.default_object, key, json_value)
 
     def get_components_node_names(self):
-        names = []
-        for node in self.generated_components:
-            names.append(node["RealName"])
-        for node in self.parent_components:
-            names.append(node["VarName"])
-        return names
+        return self.components.node_names()
 
     def get_generated_component(self, name : str):
-        for cmp in ue.get_blueprint_components(self.bp):
-            if cmp.get_name() == name: return cmp
-        return None
+        return self.components.get_template(self.bp, name)
     
     def get_component_by_node_name(self, name : str):
         cmp = self.get_generated_component(name)
         if cmp is not None: return cmp
-        for cmp in self.parent_components:
-            if cmp["VarName"] == name: return self.default_object.get_property(cmp["RealName"])
+        parent = self.components.get_parent_by_node_name(name)
+        if parent is not None: return self.default_object.get_property(parent["RealName"])
         return None
 
+    @ProfilingUtil.timed("blueprint.set_component_properties")
     def set_component_properties(self, name : str, props):
         if props is None or len(props) == 0: return
         cmp = self.get_component_by_node_name(name)
         if cmp is None: return
+        LoggingUtil.set_context(object=name)
         for key, value in props.items():
             UETools.set_property(cmp, key, value)
+        LoggingUtil.set_context(object=None)
 
+    @ProfilingUtil.timed("blueprint.save_defaults")
     def save_defaults(self):
         if self.default_object is None: return
-        self.default_object.save_package()
\ No newline at end of file
+        self.default_object.save_package()
+        UETools.invalidate_object_cache(self.path)
+
+# Replays a conversion plan from Tools.Plan, returns the generator.
+# With the fingerprint of the previously applied plan only the differences are rebuilt
+@ProfilingUtil.timed("blueprint.apply_plan")
+def apply_plan(plan : dict, previous_fingerprint : dict = None):
+    bp = BPGenerator(plan["Package"], plan=plan)
+
+    with bp.deferred_compile():
+        if previous_fingerprint is not None and not bp.created:
+            LoggingUtil.header("Updating")
+            bp.update(plan, previous_fingerprint)
+            LoggingUtil.undent()
+        else:
+            bp.clear()
+
+            bp.set_parent(UETools.find_object(plan["Parent"]))
+
+            bp.add_vars(plan["Variables"])
+
+            bp.layout_events(plan["Functions"])
+            for node in plan["Functions"]:
+                bp.add_planned_function(node)
+
+            bp.add_components()
+
+            bp.compile()
+        LoggingUtil.reset()
+
+        bp.load_defaults()
+        bp.log_compile_stats()
+
+    defaults = plan["Defaults"]
+
+    allNotSet = []
+
+    LoggingUtil.header("Setting Defaults")
+    for key in defaults:
+        didSet = bp.set_default_value(key, defaults[key])
+        if not didSet: allNotSet.append(key)
+    LoggingUtil.undent()
+
+    for node_name in bp.get_components_node_names():
+        props = plan["ComponentProperties"].get(node_name)
+        if props is not None:
+            LoggingUtil.header(f"Setting {node_name}")
+            bp.set_component_properties(node_name, props)
+            LoggingUtil.undent()
+
+    bp.save_defaults()
+    return bp
+
+def apply_plan_file(path : str, previous_fingerprint : dict = None):
+    return apply_plan(Plan.load_plan(path), previous_fingerprint)
+
+# Full conversion of a Blueprint export, returns the generator
+def generate(fmodel : Tools.FModel.FModelJson):
+    return apply_plan(Plan.plan_blueprint(fmodel))
@@ -0,0 +1,211 @@
+'''
+SQLite catalog of an FModel export tree.
+
+Every export of every file is recorded with its Name, Type, Class, Outer and SuperStruct plus the
+packages it references, so "where is X defined" is a query instead of re-reading the json.
+Files are indexed in parallel (processes from the command line, threads in the editor) and only files whose mtime or size changed are read again.
+
+python -m Tools.Catalog <export dir> <catalog path> [--workers N]
+'''
+
+import argparse
+import json
+import os
+import sqlite3
+
+import Tools.Dependencies as Dependencies
+import Tools.FModel as FTools
+import Tools.Pool as Pool
+
+# Bump when the schema or what is extracted changes, the catalog is then rebuilt
+CATALOG_VERSION = 1
+
+# Root classes of the exports the batch converter generates
+ROOT_TYPES = ("BlueprintGeneratedClass", "WidgetBlueprintGeneratedClass")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER,
+    package TEXT,
+    kind TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS exports (
+    path TEXT,
+    idx INTEGER,
+    name TEXT,
+    type TEXT,
+    class TEXT,
+    outer TEXT,
+    super_struct TEXT
+);
+CREATE TABLE IF NOT EXISTS refs (
+    path TEXT,
+    package TEXT
+);
+CREATE INDEX IF NOT EXISTS exports_path ON exports (path);
+CREATE INDEX IF NOT EXISTS exports_name ON exports (name);
+CREATE INDEX IF NOT EXISTS exports_type ON exports (type);
+CREATE INDEX IF NOT EXISTS refs_path ON refs (path);
+CREATE INDEX IF NOT EXISTS files_package ON files (package);
+"""
+
+# "/Game/Path/Asset" of an export file below the Content export directory
+def get_file_package(path : str, root_dir : str, mount : str = "/Game"):
+    relative = os.path.splitext(os.path.relpath(path, root_dir))[0]
+    return mount + "/" + relative.replace(os.sep, "/")
+
+def _get_ref_path(ref):
+    if isinstance(ref, dict) and ref.get("ObjectPath") is not None:
+        return FTools.join_object_path(ref["ObjectPath"])
+    return None
+
+def _walk_refs(value, found : set):
+    stack = [value]
+    while len(stack) > 0:
+        value = stack.pop()
+        if isinstance(value, dict):
+            object_path = value.get("ObjectPath")
+            if isinstance(object_path, (str, tuple, list)):
+                dep = Dependencies.get_reference_package(object_path)
+                if dep is not None: found.add(dep)
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+
+# (kind, package, export rows, referenced packages) of a file
+def _index_file(job):
+    path, package = job
+    file_package = package
+    # Read directly, the FModelJson disk cache would get an entry for every file in the tree
+    with open(path, "rb") as fp, FTools.gc_paused():
+        nodes = json.load(fp)
+    rows = []
+    refs = set()
+    kind = None
+    for i, node in enumerate(nodes):
+        if not isinstance(node, dict): continue
+        rows.append((
+            path, i, node.get("Name"), node.get("Type"), node.get("Class"), node.get("Outer"),
+            _get_ref_path(node.get("SuperStruct")),
+        ))
+        if kind is None and node.get("Type") in ROOT_TYPES and "ClassDefaultObject" in node:
+            kind = node["Type"]
+            package = FTools.split_object_path(node["ClassDefaultObject"]["ObjectPath"])[0]
+        _walk_refs(node, refs)
+    refs.discard(package)
+    refs.discard(file_package)
+    return kind, package, rows, refs
+
+class Catalog:
+    """
+    Connection to a catalog file, refresh() brings it in line with the export directory.
+    """
+    def __init__(self, path : str, root_dir : str = None):
+        self.path = path
+        self.root_dir = root_dir
+        self.db = sqlite3.connect(path)
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS exports; DROP TABLE IF EXISTS refs;")
+            self.db.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # Indexes new and changed files and drops deleted ones, returns (indexed, removed) counts
+    def refresh(self, root_dir : str = None, max_workers : int = None, processes : bool = False):
+        root_dir = root_dir or self.root_dir
+        self.root_dir = root_dir
+
+        known = {path: (mtime, size) for path, mtime, size in self.db.execute("SELECT path, mtime_ns, size FROM files")}
+        seen = set()
+        jobs = []
+        stats = {}
+        for dir_path, _, files in os.walk(root_dir):
+            for file_name in sorted(files):
+                if not file_name.lower().endswith(".json"): continue
+                path = os.path.join(dir_path, file_name)
+                seen.add(path)
+                stat = os.stat(path)
+                stats[path] = (stat.st_mtime_ns, stat.st_size)
+                if known.get(path) != stats[path]:
+                    jobs.append((path, get_file_package(path, root_dir)))
+
+        removed = [path for path in known if path not in seen]
+        with self.db:
+            for path in removed: self.__forget(path)
+
+        if len(jobs) > 0:
+            results = Pool.map_guarded(_index_file, jobs, max_workers, processes, chunksize=16)
+            with self.db:
+                for (path, package), result, error in results:
+                    kind, rows, refs = None, [], ()
+                    if error is None: kind, package, rows, refs = result
+                    self.__forget(path)
+                    mtime, size = stats[path]
+                    self.db.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", (path, mtime, size, package, kind, error))
+                    self.db.executemany("INSERT INTO exports VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                    self.db.executemany("INSERT INTO refs VALUES (?, ?)", ((path, ref) for ref in refs))
+
+        return len(jobs), len(removed)
+
+    def __forget(self, path : str):
+        for table in ("files", "exports", "refs"):
+            self.db.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    # [(package, file path, export index, type)] of exports named name, optionally of a type
+    def find_definitions(self, name : str, type : str = None):
+        query = "SELECT f.package, e.path, e.idx, e.type FROM exports e JOIN files f ON f.path = e.path WHERE e.name = ?"
+        args = [name]
+        if type is not None:
+            query += " AND e.type = ?"
+            args.append(type)
+        return self.db.execute(query + " ORDER BY e.path, e.idx", args).fetchall()
+
+    # Package of the first export named name, None when it isn't in the catalog
+    def find_package(self, name : str, type : str = None):
+        found = self.find_definitions(name, type)
+        return found[0][0] if len(found) > 0 else None
+
+    def get_dependencies(self, package : str):
+        return set(row[0] for row in self.db.execute(
+            "SELECT DISTINCT r.package FROM refs r JOIN files f ON f.path = r.path WHERE f.package = ?", (package,)
+        ))
+
+    # Files that failed to index: { path: error }
+    def get_errors(self):
+        return dict(self.db.execute("SELECT path, error FROM files WHERE error IS NOT NULL"))
+
+    # Same records as Tools.Batch.discover_exports for the files with a root class of one of kinds
+    def get_exports(self, kinds = ROOT_TYPES):
+        rows = self.db.execute(
+            f"SELECT path, kind, package FROM files WHERE kind IN ({','.join('?' * len(kinds))}) ORDER BY path", tuple(kinds)
+        ).fetchall()
+        deps = {}
+        for path, package in self.db.execute("SELECT path, package FROM refs"):
+            deps.setdefault(path, set()).add(package)
+        return [
+            {"Path": path, "Kind": kind, "Package": package, "Dependencies": deps.get(path, set())}
+            for path, kind, package in rows
+        ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Index an FModel export tree into a SQLite catalog")
+    parser.add_argument("export_dir")
+    parser.add_argument("catalog_path")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    catalog = Catalog(args.catalog_path, args.export_dir)
+    indexed, removed = catalog.refresh(max_workers=args.workers, processes=True)
+    print(f"Indexed {indexed} files, removed {removed}")
+    for path, error in catalog.get_errors().items():
+        print(f"FAILED: {path}\n{error}")
+    catalog.close()
+
+if __name__ == "__main__":
+    main()
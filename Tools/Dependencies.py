@@ -0,0 +1,121 @@
+'''
+Cross asset dependency graph of FModel exports and plans.
+
+Every ObjectPath reference in a file is a dependency on the package it points into. The graph orders
+a batch so referenced assets are generated before the assets that find_object them.
+'''
+
+from typing import Dict, Iterable, List, Set
+import re
+
+import Tools.FModel as FTools
+
+_OBJECT_PATH = re.compile(rb'"ObjectPath":\s*"([^"]*)"')
+
+# Native packages always exist in the editor and are never generated
+NATIVE_PREFIX = "/Script/"
+
+def get_reference_package(object_path):
+    package = FTools.split_object_path(object_path)[0]
+    if package == "" or package.startswith(NATIVE_PREFIX): return None
+    return package
+
+# Packages referenced anywhere in the raw bytes of an export or plan, found without decoding anything
+def find_references(data : bytes, package : str = None) -> Set[str]:
+    deps = set()
+    for object_path in set(_OBJECT_PATH.findall(data)):
+        dep = get_reference_package(object_path.decode("utf8"))
+        if dep is not None: deps.add(dep)
+    deps.discard(package)
+    return deps
+
+def scan_references(path : str, package : str = None) -> Set[str]:
+    with open(path, "rb") as fp:
+        return find_references(fp.read(), package)
+
+class DependencyGraph:
+    """
+    Package -> packages it references. Only edges between packages in the graph affect the schedule.
+    """
+    edges : Dict[str, Set[str]]
+
+    def __init__(self):
+        self.edges = {}
+
+    @classmethod
+    def from_exports(cls, exports : Iterable[dict]):
+        graph = cls()
+        for export in exports:
+            graph.add(export["Package"], export["Dependencies"])
+        return graph
+
+    def add(self, package : str, dependencies : Iterable[str]):
+        self.edges.setdefault(package, set()).update(dependencies)
+
+    def dependencies(self, package : str):
+        return sorted(dep for dep in self.edges.get(package, ()) if dep in self.edges and dep != package)
+
+    # Strongly connected components, each component is listed after every component it depends on
+    def components(self) -> List[List[str]]:
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        components = []
+
+        for root in sorted(self.edges):
+            if root in index: continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.dependencies(root)))]
+
+            while len(work) > 0:
+                node, deps = work[-1]
+                for dep in deps:
+                    if dep not in index:
+                        index[dep] = low[dep] = len(index)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.dependencies(dep))))
+                        break
+                    elif dep in on_stack:
+                        low[node] = min(low[node], index[dep])
+                else:
+                    work.pop()
+                    if len(work) > 0:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node: break
+                        components.append(sorted(component))
+
+        return components
+
+    # Groups of packages that reference each other, they can't be ordered and may need a second pass
+    def find_cycles(self) -> List[List[str]]:
+        return [component for component in self.components() if len(component) > 1]
+
+    # Packages grouped so each level only depends on earlier levels, packages in a level are independent
+    # Members of a cycle share a level
+    def levels(self) -> List[List[str]]:
+        level_of = {}
+        levels = []
+        for component in self.components():
+            members = set(component)
+            level = 0
+            for package in component:
+                for dep in self.dependencies(package):
+                    if dep not in members: level = max(level, level_of[dep] + 1)
+            for package in component: level_of[package] = level
+            while len(levels) <= level: levels.append([])
+            levels[level].extend(component)
+        return [sorted(level) for level in levels]
+
+    def schedule(self) -> List[str]:
+        return [package for level in self.levels() for package in level]
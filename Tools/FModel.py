@@ -1,12 +1,236 @@
-from typing import List
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List
+import gc
+import hashlib
 import json
+import marshal
+import mmap
+import os
+import re
+import sys
+import threading
+
+import ProfilingUtil
+
+# Keys that get a hash index built over them the first time they are queried
+INDEXED_KEYS = ("Name", "Type", "Outer", "Class")
+
+# Parsed exports are cached here when set, see set_cache_dir
+default_cache_dir = None
+
+# Bump when the cached layout changes, old entries are then ignored
+CACHE_VERSION = 1
+
+_DECODER = json.JSONDecoder()
+_SEPARATOR = re.compile(rb'[ \t\r\n,]*')
+
+# Bytes of the export array decoded at a time, grown until the next export fits
+SCAN_WINDOW = 1 << 16
+
+# Text of buffer[start:end] cut back to a whole utf8 character
+def _decode_window(buffer, start : int, end : int):
+    while end < len(buffer) and end > start and buffer[end] & 0xC0 == 0x80: end -= 1
+    return buffer[start:end].decode("utf8")
+
+# Walks the top level array of an FModel export and yields the (start, end) byte span of each export with the decoded export
+# Only a window around the current export is decoded, so memory follows the largest export instead of the file
+def scan_exports(buffer):
+    pos = _SEPARATOR.match(buffer).end()
+    if buffer[pos:pos + 1] != b"[":
+        raise json.JSONDecodeError("Expecting '[' of the export array", buffer[:64].decode("utf8", "replace"), pos)
+    pos += 1
+    window = SCAN_WINDOW
+    while True:
+        pos = _SEPARATOR.match(buffer, pos).end()
+        if pos >= len(buffer): raise json.JSONDecodeError("Unterminated export array", "", pos)
+        if buffer[pos:pos + 1] == b"]": return
+        while True:
+            text = _decode_window(buffer, pos, pos + window)
+            try:
+                node, end = _DECODER.raw_decode(text)
+                break
+            except json.JSONDecodeError:
+                # Cut off by the window unless it already reaches the end of the file
+                if pos + window >= len(buffer): raise
+                window *= 2
+        end = pos + (end if text.isascii() else len(text[:end].encode("utf8")))
+        yield (pos, end), node
+        pos = end
+
+# (package, export index) of an ObjectPath, index is None for paths without one ("/Script/Engine")
+# Takes the "Package.Index" string of a normal load, or the pre-split tuple of a compact load (a list after a json round trip)
+def split_object_path(object_path):
+    if isinstance(object_path, (tuple, list)):
+        return (object_path[0], object_path[1])
+    package, _, index = object_path.partition(".")
+    if index == "": return (package, None)
+    return (package, int(index) if index.isdigit() else index)
+
+def join_object_path(object_path):
+    if isinstance(object_path, str): return object_path
+    package, index = split_object_path(object_path)
+    return package if index is None else f"{package}.{index}"
+
+# Strings longer than this are rarely repeated and are not interned
+COMPACT_STRING_MAX = 256
+
+# object_pairs_hook of a compact load: keys and short string values are shared between nodes
+# and ObjectPath references are stored pre-split as (package, index)
+def make_compact_hook():
+    strings = {}
+    share = strings.setdefault
+    def hook(pairs):
+        obj = {}
+        for key, value in pairs:
+            if isinstance(value, str) and len(value) <= COMPACT_STRING_MAX:
+                value = share(value, value)
+            obj[sys.intern(key)] = value
+        object_path = obj.get("ObjectPath")
+        if isinstance(object_path, str):
+            package, index = split_object_path(object_path)
+            if isinstance(index, int): obj["ObjectPath"] = (share(package, package), index)
+        return obj
+    return hook
+
+class LazyNodes:
+    """
+    Read only sequence over the exports of an FModel json file.
+    Only the byte span and the INDEXED_KEYS of each export are kept, full nodes are decoded on access.
+    """
+    __file = None
+    __buffer = None
+    __hook = None
+    __spans : List[tuple]
+    __summaries : List[tuple]
+    __cache : Dict[int, dict]
+
+    def __init__(self, path : str, object_pairs_hook = None):
+        self.__hook = object_pairs_hook
+        self.__spans = []
+        self.__summaries = []
+        self.__cache = {}
+        self.__file = open(path, "rb")
+        try:
+            self.__buffer = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            self.__buffer = b""
+
+        try:
+            for span, node in scan_exports(self.__buffer):
+                self.__spans.append(span)
+                self.__summaries.append(tuple(node.get(key, None) for key in INDEXED_KEYS))
+        except:
+            self.close()
+            raise
+
+    def __len__(self): return len(self.__spans)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0: index += len(self)
+        node = self.__cache.get(index)
+        if node is None:
+            start, end = self.__spans[index]
+            node = json.loads(self.__buffer[start:end], object_pairs_hook=self.__hook)
+            self.__cache[index] = node
+        return node
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    # Value of an indexed key without decoding the node
+    def summary(self, index : int, key : str):
+        return self.__summaries[index][INDEXED_KEYS.index(key)]
+
+    def span(self, index : int): return self.__spans[index]
+
+    # Drops decoded nodes, they will be decoded again on next access
+    def release(self):
+        self.__cache.clear()
+
+    def close(self):
+        self.release()
+        if isinstance(self.__buffer, mmap.mmap): self.__buffer.close()
+        if self.__file is not None: self.__file.close()
+        self.__file = None
+
+# Decoded exports hold no reference cycles, collecting while millions of containers are allocated only costs time
+# The collector switch is process wide, so only the main thread toggles it: decodes on the prefetch thread or in
+# widget planning threads run with it on rather than race the main thread or leave it disabled
+@contextmanager
+def gc_paused():
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled: gc.enable()
+
+# Deleting the directory is always safe, entries of changed exports are never read again
+def set_cache_dir(path : str = None):
+    global default_cache_dir
+    default_cache_dir = path
+
+# Cache file of an export, changes whenever the export is modified or the Python marshal format differs
+def get_cache_path(path : str, directory : str, compact : bool = False):
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{CACHE_VERSION}|{marshal.version}|{compact}"
+    return os.path.join(directory, hashlib.sha1(key.encode("utf8")).hexdigest() + ".fmc")
+
+# (nodes, index) from the cache, None when missing or unreadable
+def read_cache(cache_path : str):
+    try:
+        with open(cache_path, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer, gc_paused():
+            return marshal.loads(buffer)
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+
+def write_cache(cache_path : str, nodes : list, index : dict):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = cache_path + ".tmp"
+    with open(temp_path, "wb") as fp:
+        marshal.dump((nodes, index), fp)
+    os.replace(temp_path, cache_path)
 
 class FModelJson:
     __nodes : list
+    __index : Dict[str, Dict[object, List[int]]]
+
+    # When streaming, exports are decoded on demand from a memory mapped file instead of loaded upfront
+    # Otherwise the parsed exports and their indexes are cached in cache_dir (or default_cache_dir) when set
+    # Compact loads share repeated strings and keep ObjectPaths as (package, index), see split_object_path
+    @ProfilingUtil.timed("fmodel.load")
+    def __init__(self, path : str, streaming : bool = False, cache_dir : str = None, compact : bool = False):
+        self.__index = {}
+        hook = make_compact_hook() if compact else None
+        if streaming:
+            self.__nodes = LazyNodes(path, hook)
+            return
+
+        directory = cache_dir if cache_dir is not None else default_cache_dir
+        cache_path = get_cache_path(path, directory, compact) if directory is not None else None
+
+        if cache_path is not None:
+            with ProfilingUtil.span("fmodel.cache_read"):
+                cached = read_cache(cache_path)
+            if cached is not None:
+                self.__nodes, self.__index = cached
+                return
 
-    def __init__(self, path : str):
-        with open(path, "r+") as fp:
-            self.__nodes = json.load(fp)
+        with open(path, "r+") as fp, gc_paused():
+            self.__nodes = json.load(fp, object_pairs_hook=hook)
+
+        if cache_path is not None:
+            for key in INDEXED_KEYS: self.__build_index(key)
+            with ProfilingUtil.span("fmodel.cache_write"):
+                write_cache(cache_path, self.__nodes, self.__index)
 
     def __getitem__(self, key):
         if isinstance(key, str):
@@ -17,22 +241,197 @@ class FModelJson:
     
     def __getattr__(self, key):
         return self[key]
-    
+
+    def is_streaming(self): return isinstance(self.__nodes, LazyNodes)
+
+    # Value of key on the node at index, avoids decoding streamed nodes for indexed keys
+    def __value(self, i : int, key : str):
+        if key in INDEXED_KEYS and self.is_streaming():
+            return self.__nodes.summary(i, key)
+        return self.__nodes[i].get(key, None)
+
+    # Builds { value: [node indexes] } for a key, nodes without the key are stored under None
+    @ProfilingUtil.timed("fmodel.index")
+    def __build_index(self, key : str):
+        index = {}
+        for i in range(len(self.__nodes)):
+            value = self.__value(i, key)
+            try:
+                index.setdefault(value, []).append(i)
+            except TypeError:
+                # Unhashable values can't be indexed, fall back to scanning
+                return None
+        self.__index[key] = index
+        return index
+
+    # Returns the node indexes matching key == value, or None if the key can't be indexed
+    def __lookup(self, key : str, value):
+        if key not in INDEXED_KEYS: return None
+        index = self.__index.get(key)
+        if index is None:
+            index = self.__build_index(key)
+            if index is None: return None
+        try:
+            return index.get(value, ())
+        except TypeError:
+            return None
+
     def get_all_of_key(self, key : str, value):
-        return self.filter(lambda node: node.get(key, None) == value)
+        return self.query(**{key: value})
     
     def get_first_of_key(self, key : str, value):
-        for node in self.__nodes:
-            if node.get(key, None) == value:
-                return node
+        found = self.__lookup(key, value)
+        if found is not None:
+            return self.__nodes[found[0]] if len(found) > 0 else None
+        for i in range(len(self.__nodes)):
+            if self.__value(i, key) == value:
+                return self.__nodes[i]
+
+    # Returns all nodes matching every key == value pair, in file order
+    def query(self, **conditions):
+        if len(conditions) == 0: return tuple(self.__nodes)
+
+        candidates = None
+        remaining = {}
+        for key, value in conditions.items():
+            found = self.__lookup(key, value)
+            if found is None:
+                remaining[key] = value
+            elif candidates is None or len(found) < len(candidates):
+                if candidates is not None:
+                    # Keep the previous (larger) candidate set as a condition to check
+                    remaining[candidate_key] = conditions[candidate_key]
+                candidates = found
+                candidate_key = key
+            else:
+                remaining[key] = value
+
+        if candidates is None:
+            candidates = range(len(self.__nodes))
+
+        return tuple(
+            self.__nodes[i] for i in candidates 
+            if all(self.__value(i, k) == v for k, v in remaining.items())
+        )
+
+    def query_first(self, **conditions):
+        found = self.query(**conditions)
+        return found[0] if len(found) > 0 else None
             
-    def get_by_name(self, name : str): self.get_first_of_key("Name", name)
+    def get_by_name(self, name : str): return self.get_first_of_key("Name", name)
 
     def nodes(self): return self.__nodes
 
     def filter(self, func): 
         return tuple(x for x in self.__nodes if func(x))
 
+    def close(self):
+        if self.is_streaming(): self.__nodes.close()
+
+# Exports decoded ahead of the one being used, and the most estimated decoded bytes they may add up to
+PREFETCH_DEPTH = 4
+PREFETCH_MAX_BYTES = 1024 * 1024 * 1024
+# Decoded exports take about this many times their file size, streaming loads only keep an index and the mapping
+DECODED_SIZE_RATIO = 8
+
+def estimate_loaded_size(path : str, streaming : bool = False):
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return 0
+    return size if streaming else size * DECODED_SIZE_RATIO
+
+class PrefetchLoader:
+    """
+    Loads the exports of paths in order on a background thread, so reading and decoding the next
+    exports overlaps with the editor work on the current one.
+    get() must be called in path order, paths that are never asked for are dropped.
+    """
+    def __init__(self, paths, depth : int = PREFETCH_DEPTH, max_bytes : int = PREFETCH_MAX_BYTES, streaming : bool = False,
+                 compact : bool = False):
+        # Paths the loader thread works through and those get() hasn't passed yet
+        self.__order = list(paths)
+        self.pending = list(self.__order)
+        self.depth = max(1, depth)
+        self.max_bytes = max_bytes
+        self.streaming = streaming
+        self.compact = compact
+        # (path, FModelJson or None, exception or None, size)
+        self.__ready = deque()
+        self.__ready_bytes = 0
+        self.__closed = False
+        self.__done = False
+        self.__condition = threading.Condition()
+        self.__thread = threading.Thread(target=self.__run, name="FModelPrefetch", daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        for path in self.__order:
+            size = estimate_loaded_size(path, self.streaming)
+            with self.__condition:
+                # A single export bigger than the cap is still loaded once nothing else is waiting
+                while not self.__closed and len(self.__ready) > 0 and (
+                    len(self.__ready) >= self.depth or self.__ready_bytes + size > self.max_bytes
+                ):
+                    self.__condition.wait()
+                if self.__closed: break
+            # Profiled under the export being loaded, not the asset the editor thread is converting
+            ProfilingUtil.set_thread_asset(path)
+            try:
+                item = (path, FModelJson(path, self.streaming, compact=self.compact), None, size)
+            except Exception as e:
+                item = (path, None, e, size)
+            finally:
+                ProfilingUtil.set_thread_asset(None)
+            with self.__condition:
+                self.__ready.append(item)
+                self.__ready_bytes += size
+                self.__condition.notify_all()
+        with self.__condition:
+            self.__done = True
+            self.__condition.notify_all()
+
+    def __pop(self):
+        with self.__condition:
+            while len(self.__ready) == 0 and not self.__done:
+                self.__condition.wait()
+            if len(self.__ready) == 0: return None
+            item = self.__ready.popleft()
+            self.__ready_bytes -= item[3]
+            self.__condition.notify_all()
+            return item
+
+    # The export at path, loaded directly when it isn't ahead in the queue
+    def get(self, path : str) -> FModelJson:
+        if path in self.pending:
+            index = self.pending.index(path)
+            # Drop exports that were skipped
+            skipped, self.pending = self.pending[:index], self.pending[index + 1:]
+            for _ in range(len(skipped) + 1):
+                item = self.__pop()
+                if item is None: break
+                loaded_path, fmodel, error, _ = item
+                if loaded_path != path:
+                    if fmodel is not None: fmodel.close()
+                    continue
+                if error is not None: raise error
+                return fmodel
+        return FModelJson(path, self.streaming, compact=self.compact)
+
+    def close(self):
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        self.__thread.join()
+        while len(self.__ready) > 0:
+            _, fmodel, _, _ = self.__ready.popleft()
+            if fmodel is not None: fmodel.close()
+        self.__ready_bytes = 0
+
+    def __enter__(self): return self
+
+    def __exit__(self, *args): self.close()
+
 # Is a dictionary { key: value } or { "key": ..., "value": ... }
 def is_dictionary_simple(items : List[dict]):
     if len(items) == 0: return True
@@ -0,0 +1,103 @@
+'''
+Reloads only the modules of this project whose source changed since they were loaded, instead of
+an importlib.reload of every module on every py_exec.
+
+Modules that import from a changed module are reloaded after it so they don't keep stale references.
+This module itself is never reloaded, restart the editor after changing it.
+'''
+
+from typing import Dict, List
+import hashlib
+import importlib
+import os
+import sys
+import types
+
+import Tools.Dependencies as Dependencies
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Source path -> (mtime_ns, size, sha1) of the version that is loaded
+_loaded : Dict[str, tuple] = {}
+
+def get_source_path(module : types.ModuleType):
+    path = getattr(module, "__file__", None)
+    if path is None or not path.endswith(".py"): return None
+    path = os.path.abspath(path)
+    if not path.startswith(PROJECT_ROOT + os.sep): return None
+    return path
+
+def get_project_modules() -> Dict[str, types.ModuleType]:
+    return {
+        name: module for name, module in list(sys.modules.items())
+        if module is not None and name != __name__ and get_source_path(module) is not None
+    }
+
+def hash_source(path : str):
+    with open(path, "rb") as fp:
+        return hashlib.sha1(fp.read()).hexdigest()
+
+# Only hashes when mtime or size changed, a touched but identical file is not a change
+def has_changed(path : str):
+    stat = os.stat(path)
+    loaded = _loaded.get(path)
+    if loaded is None:
+        # First time seen, it was just imported so it is current
+        _loaded[path] = (stat.st_mtime_ns, stat.st_size, hash_source(path))
+        return False
+    mtime, size, digest = loaded
+    if (stat.st_mtime_ns, stat.st_size) == (mtime, size): return False
+    new_digest = hash_source(path)
+    _loaded[path] = (stat.st_mtime_ns, stat.st_size, new_digest)
+    return new_digest != digest
+
+# Names of project modules a module holds a reference to, as a module or through from imports
+def get_module_references(module : types.ModuleType, project_modules : Dict[str, types.ModuleType]):
+    refs = set()
+    for value in list(vars(module).values()):
+        if isinstance(value, types.ModuleType):
+            name = value.__name__
+        else:
+            name = getattr(value, "__module__", None)
+        # A package holds its submodules as attributes without depending on them
+        if name is None or name.startswith(module.__name__ + "."): continue
+        if name in project_modules and name != module.__name__: refs.add(name)
+    return refs
+
+def reload_changed() -> List[str]:
+    project_modules = get_project_modules()
+    changed = set()
+    for name, module in project_modules.items():
+        try:
+            if has_changed(get_source_path(module)): changed.add(name)
+        except OSError:
+            # Source was removed, keep the loaded version
+            pass
+    if len(changed) == 0: return []
+
+    graph = Dependencies.DependencyGraph()
+    for name, module in project_modules.items():
+        graph.add(name, get_module_references(module, project_modules))
+
+    # Everything that references a changed module, directly or through other reloaded modules
+    dependents = {}
+    for name in project_modules:
+        for dep in graph.dependencies(name):
+            dependents.setdefault(dep, set()).add(name)
+    to_reload = set(changed)
+    stack = list(changed)
+    while len(stack) > 0:
+        for dependent in dependents.get(stack.pop(), ()):
+            if dependent not in to_reload:
+                to_reload.add(dependent)
+                stack.append(dependent)
+
+    reloaded = []
+    for name in graph.schedule():
+        if name not in to_reload: continue
+        importlib.reload(project_modules[name])
+        path = get_source_path(project_modules[name])
+        stat = os.stat(path)
+        _loaded[path] = (stat.st_mtime_ns, stat.st_size, hash_source(path))
+        reloaded.append(name)
+    return reloaded
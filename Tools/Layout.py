@@ -0,0 +1,61 @@
+'''
+Deterministic node positions for generated graphs.
+
+Positions only depend on the plan, so re-running a conversion puts every node in the same place
+and nothing has to walk the nodes already in a graph to find free space.
+'''
+
+from typing import Dict, Iterable, Tuple
+
+import Tools.Plan as Plan
+
+# Graph units, roughly the size the editor draws a node with
+COLUMN_WIDTH = 600
+COLUMN_HEIGHT = 4000
+NODE_HEADER_HEIGHT = 64
+PIN_HEIGHT = 24
+NODE_SPACING = 64
+
+# Function result node relative to the function entry node
+FUNCTION_RESULT_OFFSET = (400, 0)
+
+def get_node_height(pin_count : int):
+    return NODE_HEADER_HEIGHT + PIN_HEIGHT * pin_count
+
+class ColumnLayout:
+    """
+    Packs nodes top to bottom into fixed width columns, a node that doesn't fit starts the next column.
+    """
+    def __init__(self, origin : Tuple[int, int] = (0, 0), column_height : int = COLUMN_HEIGHT, column_width : int = COLUMN_WIDTH):
+        self.origin = origin
+        self.column_height = column_height
+        self.column_width = column_width
+        self.column = 0
+        self.cursor = 0
+
+    def place(self, height : int) -> Tuple[int, int]:
+        if self.cursor > 0 and self.cursor + height > self.column_height:
+            self.column += 1
+            self.cursor = 0
+        position = (self.origin[0] + self.column * self.column_width, self.origin[1] + self.cursor)
+        self.cursor += height + NODE_SPACING
+        return position
+
+# First free row below nodes already in a graph, from their (x, y) positions
+def get_free_origin(positions : Iterable[Tuple[int, int]]):
+    bottom = None
+    for _, y in positions:
+        if bottom is None or y > bottom: bottom = y
+    if bottom is None: return (0, 0)
+    return (0, bottom + COLUMN_HEIGHT // 10)
+
+# { event name: (x, y) } for the custom events of planned functions, in plan order
+def plan_event_layout(functions : Iterable[dict], layout : ColumnLayout) -> Dict[str, Tuple[int, int]]:
+    positions = {}
+    for func in functions:
+        if func["Kind"] != Plan.EVENT or func["Override"]: continue
+        positions[func["Name"]] = layout.place(get_node_height(len(func["Params"])))
+    return positions
+
+def get_function_result_position(entry_position : Tuple[int, int]):
+    return (entry_position[0] + FUNCTION_RESULT_OFFSET[0], entry_position[1] + FUNCTION_RESULT_OFFSET[1])
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+
+# Bump whenever the generated output changes so every asset is regenerated on the next run
+GENERATOR_VERSION = 1
+
+def hash_file(path : str):
+    h = hashlib.sha1()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def hash_values(*values):
+    h = hashlib.sha1()
+    for value in values:
+        h.update(str(value).encode("utf8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+class Manifest:
+    """
+    Record of what each generated asset was built from, stored as json next to the output assets.
+    An asset's hash covers its source export, the generator version and the hashes of its dependencies.
+    """
+    path = ""
+    entries : dict
+
+    def __init__(self, path : str):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf8") as fp:
+                data = json.load(fp)
+            if data.get("Version") == GENERATOR_VERSION:
+                self.entries = data.get("Assets", {})
+
+    def get_hash(self, package : str):
+        entry = self.entries.get(package)
+        return entry["Hash"] if entry is not None else None
+
+    # Hash the asset would have if generated now, dependencies outside the manifest count as unchanged
+    def compute_hash(self, source_path : str, dependencies, known_hashes : dict = None):
+        if known_hashes is None: known_hashes = {}
+        source_hash = hash_file(source_path)
+        dependency_hashes = [
+            (dep, known_hashes.get(dep, self.get_hash(dep))) for dep in sorted(dependencies)
+        ]
+        return hash_values(GENERATOR_VERSION, source_hash, dependency_hashes)
+
+    # Fingerprint of the plan the asset was last generated from, see Tools.Plan.fingerprint_plan
+    def get_fingerprint(self, package : str):
+        entry = self.entries.get(package)
+        return entry.get("Fingerprint") if entry is not None else None
+
+    def is_up_to_date(self, package : str, asset_hash : str):
+        return self.get_hash(package) == asset_hash
+
+    def update(self, package : str, asset_hash : str, source_path : str, fingerprint : dict = None):
+        self.entries[package] = {
+            "Hash": asset_hash,
+            "Source": source_path,
+            "Fingerprint": fingerprint,
+        }
+
+    def remove(self, package : str):
+        self.entries.pop(package, None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf8") as fp:
+            json.dump({"Version": GENERATOR_VERSION, "Assets": self.entries}, fp, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,282 @@
+'''
+Editor independent planning stage.
+
+Turns an FModel export into a json serializable conversion plan that Tools.Blueprint.apply_plan replays in the editor.
+Object references are kept as their FModel json and only resolved at apply time.
+
+python -m Tools.Plan <export dir> <plan dir> [--workers N]
+'''
+
+import argparse
+import hashlib
+import json
+import os
+
+import ProfilingUtil
+import Tools.FModel as FTools
+import Tools.Pool as Pool
+from Tools.Flags import PropertyFlags, FunctionFlags
+
+PLAN_VERSION = 1
+
+FUNCTION = "Function"
+EVENT = "Event"
+DELEGATE = "Delegate"
+
+# Variables the generator never recreates
+IGNORED_VARIABLES = ("DefaultSceneRoot", "UberGraphFrame")
+IGNORED_VARIABLE_TYPES = ("MulticastInlineDelegateProperty",)
+
+def plan_property_type(props : dict):
+    planned = {}
+
+    if props["Type"].endswith("Property"):
+        planned["Type"] = props["Type"][:-len("Property")].lower()
+
+    if props["Type"] == "ObjectProperty":
+        planned["Ref"] = props["PropertyClass"]
+    elif props["Type"] == "ClassProperty":
+        planned["Ref"] = props["MetaClass"]
+    elif props["Type"] == "SoftObjectProperty":
+        planned["Ref"] = props["PropertyClass"]
+    elif props["Type"] == "SoftClassProperty":
+        planned["Ref"] = props["MetaClass"]
+    elif props["Type"] == "StructProperty":
+        planned["Ref"] = props["Struct"]
+    elif props["Type"] == "ByteProperty" and props.get("Enum", None) is not None:
+        planned["Ref"] = props["Enum"]
+    elif props["Type"] == "EnumProperty":
+        planned["Type"] = "byte"
+        planned["Ref"] = props["Enum"]
+    elif props["Type"] == "StrProperty":
+        planned["Type"] = "String"
+    elif props["Type"] == "InterfaceProperty":
+        planned["Type"] = "interface"
+        planned["Ref"] = props["InterfaceClass"]
+
+    return planned
+
+# Mirrors the kwargs of EdGraphPinType, ContainerType is the EPinContainerType member name
+def plan_pin_type(props : dict):
+    planned = {}
+
+    if props["Type"] == "ArrayProperty":
+        props = props["Inner"]
+        planned["ContainerType"] = "Array"
+    elif props["Type"] == "MapProperty":
+        planned["ContainerType"] = "Map"
+        valueRes = plan_property_type(props["ValueProp"])
+
+        valuePlan = {
+            "TerminalCategory": valueRes["Type"]
+        }
+
+        if "Ref" in valueRes:
+            valuePlan["TerminalSubCategoryObject"] = valueRes["Ref"]
+
+        planned["PinValueType"] = valuePlan
+
+        props = props["KeyProp"]
+    elif props["Type"] == "SetProperty":
+        props = props["ElementProp"]
+        planned["ContainerType"] = "Set"
+
+    res = plan_property_type(props)
+    planned["PinCategory"] = res["Type"]
+
+    if "Ref" in res:
+        planned["PinSubCategoryObject"] = res["Ref"]
+
+    return planned
+
+def plan_param(prop : dict):
+    return {
+        "Name": prop["Name"],
+        "PropertyFlags": prop.get("PropertyFlags", 0),
+        "PinType": plan_pin_type(prop),
+    }
+
+def get_function_kind(node : dict):
+    # Event binding to a delegate
+    if node.get("Name").startswith("BndEvt__"):
+        return None
+    elif node.get("Name").endswith("__DelegateSignature"):
+        return DELEGATE
+    elif FunctionFlags.FUNC_Event in FunctionFlags(node["FunctionFlags"]):
+        return EVENT
+    else:
+        return FUNCTION
+
+def plan_function(node : dict):
+    return {
+        "Name": node["Name"],
+        "Kind": get_function_kind(node),
+        "FunctionFlags": node["FunctionFlags"],
+        "Override": "SuperStruct" in node,
+        "Params": [
+            plan_param(prop) for prop in node.get("ChildProperties", [])
+            if PropertyFlags.CPF_Parm in PropertyFlags(prop.get("PropertyFlags", 0))
+        ],
+    }
+
+def is_function(node : dict):
+    return not (
+        node.get("Name").startswith("ExecuteUbergraph") or
+        node.get("Name") in tuple("UserConstructionScript")
+    )
+
+def plan_generated_components(fmodel : FTools.FModelJson):
+    cmps = []
+    for scs_node in fmodel.get_all_of_key("Type", "SCS_Node"):
+        props = scs_node["Properties"]
+        if props["ComponentClass"]["ObjectName"] == "Class'SceneComponent'": continue
+        cmp_type = props["ComponentClass"]["ObjectName"][:-1].split("'")[-1]
+        var_name = props["InternalVariableName"]
+        prop_name = props["ComponentTemplate"]["ObjectName"].split(":")[-1][:-1]
+        cmps.append({
+            "Type": cmp_type,
+            "VarName": var_name,
+            "RealName": prop_name,
+            "Class": props["ComponentClass"]
+        })
+
+    return cmps
+
+def plan_parent_components(fmodel : FTools.FModelJson):
+    cmps = []
+    root = fmodel.get_first_of_key("Type", "BlueprintGeneratedClass")
+    default_node = fmodel.get_first_of_key("Type", root["Name"])
+    default_name = default_node["Name"]
+    defaults = default_node.get("Properties", {})
+
+    def is_json_component(json_value):
+        if not isinstance(json_value, dict): return False
+        if ("ObjectName" not in json_value) or ("ObjectPath" not in json_value): return False
+        return f"'{default_name}:" in json_value["ObjectName"]
+
+    for key in [k for k in defaults if is_json_component(defaults[k])]:
+        v = defaults[key]
+
+        cmps.append({
+            "VarName": v["ObjectName"].split(":")[-1][:-1],
+            "RealName": key,
+        })
+
+    return cmps
+
+def plan_variable(var : dict, component_names):
+    if var.get("Name") in IGNORED_VARIABLES: return None
+    if var.get("Type") in IGNORED_VARIABLE_TYPES: return None
+    if var.get("Name") in component_names: return None
+    return {
+        "Name": var["Name"],
+        "PropertyFlags": var.get("PropertyFlags", 0),
+        "PinType": plan_pin_type(var),
+    }
+
+@ProfilingUtil.timed("plan.blueprint")
+def plan_blueprint(fmodel : FTools.FModelJson, source : str = ""):
+    root = fmodel.get_first_of_key("Type", "BlueprintGeneratedClass")
+    components = plan_generated_components(fmodel)
+    parent_components = plan_parent_components(fmodel)
+    component_names = set(cmp["VarName"] for cmp in components)
+
+    variables = [plan_variable(var, component_names) for var in root.get("ChildProperties", [])]
+
+    functions = []
+    for node in filter(is_function, fmodel.query(Type="Function", Outer=root.get("Name"))):
+        planned = plan_function(node)
+        if planned["Kind"] is not None: functions.append(planned)
+
+    default_node = fmodel.get_first_of_key("Type", root["Name"])
+
+    component_properties = {}
+    node_names = [cmp["RealName"] for cmp in components] + [cmp["VarName"] for cmp in parent_components]
+    for node_name in node_names:
+        node = fmodel.get_first_of_key("Name", node_name)
+        if node is not None and "Properties" in node:
+            component_properties[node_name] = node["Properties"]
+
+    return {
+        "Version": PLAN_VERSION,
+        "Source": source,
+        "Package": FTools.split_object_path(root["ClassDefaultObject"]["ObjectPath"])[0],
+        "Parent": root.get("SuperStruct"),
+        "Variables": [var for var in variables if var is not None],
+        "Functions": functions,
+        "Components": components,
+        "ParentComponents": parent_components,
+        "Defaults": default_node.get("Properties", {}) if default_node is not None else {},
+        "ComponentProperties": component_properties,
+    }
+
+def hash_plan_item(item):
+    return hashlib.sha1(json.dumps(item, sort_keys=True).encode("utf8")).hexdigest()
+
+# Per item hashes of the structural parts of a plan, small enough to keep in the manifest for later diffs
+def fingerprint_plan(plan : dict):
+    return {
+        "Parent": hash_plan_item(plan["Parent"]),
+        "Variables": {var["Name"]: hash_plan_item(var) for var in plan["Variables"]},
+        "Functions": {func["Name"]: hash_plan_item(func) for func in plan["Functions"]},
+        "Components": {cmp["VarName"]: hash_plan_item(cmp) for cmp in plan["Components"]},
+    }
+
+# Names to add, remove and modify in a fingerprint section ("Variables", "Functions" or "Components")
+def diff_fingerprints(old : dict, new : dict, section : str):
+    old_items = old.get(section, {})
+    new_items = new.get(section, {})
+    return {
+        "Add": [name for name in new_items if name not in old_items],
+        "Remove": [name for name in old_items if name not in new_items],
+        "Modify": [name for name in new_items if name in old_items and old_items[name] != new_items[name]],
+    }
+
+def plan_file(path : str):
+    fmodel = FTools.FModelJson(path)
+    return plan_blueprint(fmodel, path)
+
+def save_plan(plan : dict, path : str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf8") as fp:
+        json.dump(plan, fp, separators=(",", ":"))
+
+def load_plan(path : str):
+    with open(path, "r", encoding="utf8") as fp:
+        return json.load(fp)
+
+def _plan_to_file(job):
+    source, target = job
+    save_plan(plan_file(source), target)
+
+# Plans every export in paths across a process pool, returns { path: error } for the failures
+def plan_files(paths, plan_dir : str, root_dir : str, max_workers : int = None):
+    jobs = [
+        (path, os.path.join(plan_dir, os.path.splitext(os.path.relpath(path, root_dir))[0] + ".plan.json"))
+        for path in paths
+    ]
+    failed = {}
+    for (source, _), _, error in Pool.map_guarded(_plan_to_file, jobs, max_workers, processes=True, chunksize=8):
+        if error is not None: failed[source] = error
+    return failed
+
+def main():
+    import Tools.Batch as Batch
+
+    parser = argparse.ArgumentParser(description="Plan Blueprint conversions outside the editor")
+    parser.add_argument("export_dir")
+    parser.add_argument("plan_dir")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = [
+        export["Path"] for export in Batch.discover_exports(args.export_dir)
+        if export["Kind"] == Batch.BLUEPRINT
+    ]
+    failed = plan_files(paths, args.plan_dir, args.export_dir, args.workers)
+    print(f"Planned {len(paths) - len(failed)}/{len(paths)} exports")
+    for path, error in failed.items():
+        print(f"FAILED: {path}\n{error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import traceback
+
+# Threads unless processes is set: inside the editor sys.executable is the editor, so a process pool would start more editors
+def make_pool(processes : bool = False, max_workers : int = None):
+    return (ProcessPoolExecutor if processes else ThreadPoolExecutor)(max_workers=max_workers)
+
+def _guarded(job):
+    func, item = job
+    try:
+        return item, func(item), None
+    except Exception:
+        return item, None, traceback.format_exc()
+
+# (item, func(item), None) or (item, None, traceback) for each item in order, one failing item doesn't stop the rest
+# func must be a module level function when processes is set
+def map_guarded(func, items, max_workers : int = None, processes : bool = False, chunksize : int = 1):
+    with make_pool(processes, max_workers) as pool:
+        yield from pool.map(_guarded, [(func, item) for item in items], chunksize=chunksize)
@@ -0,0 +1,83 @@
+'''
+Parser for the type strings of FProperty.get_type_str, e.g. "MapProperty<NameProperty,ArrayProperty<FVector>>".
+
+Descriptors are immutable and interned, equal types are the same object and each string is only parsed once.
+'''
+
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+import re
+
+ARRAY = "ArrayProperty"
+SET = "SetProperty"
+MAP = "MapProperty"
+STRUCT = "UScriptStruct"
+
+CONTAINERS = (ARRAY, SET, MAP)
+
+_TOKEN = re.compile(r"\s*([<>,]|[^<>,\s]+)")
+
+class TypeDesc(NamedTuple):
+    kind : str
+    # Element type of arrays and sets, key and value type of maps
+    args : Tuple["TypeDesc", ...] = ()
+    # Struct name when the type string carries one ("UScriptStruct:Name")
+    struct : Optional[str] = None
+
+    @property
+    def inner(self): return self.args[0] if len(self.args) > 0 else None
+
+    @property
+    def key(self): return self.args[0] if self.kind == MAP else None
+
+    @property
+    def value(self): return self.args[1] if self.kind == MAP else None
+
+    def is_container(self): return self.kind in CONTAINERS
+
+    def __str__(self):
+        name = self.kind if self.struct is None else f"{self.kind}:{self.struct}"
+        if len(self.args) == 0: return name
+        return f"{name}<{','.join(str(arg) for arg in self.args)}>"
+
+_interned : Dict[TypeDesc, TypeDesc] = {}
+
+def intern(desc : TypeDesc) -> TypeDesc:
+    return _interned.setdefault(desc, desc)
+
+def _tokenize(typeStr : str):
+    tokens = []
+    pos = 0
+    while pos < len(typeStr):
+        m = _TOKEN.match(typeStr, pos)
+        if m is None: break
+        tokens.append(m.group(1))
+        pos = m.end()
+    if typeStr[pos:].strip() != "":
+        raise ValueError(f"Malformed type string {typeStr!r}")
+    return tokens
+
+def _parse(tokens : list, pos : int, typeStr : str):
+    if pos >= len(tokens) or tokens[pos] in "<>,":
+        raise ValueError(f"Malformed type string {typeStr!r}")
+    kind, _, struct = tokens[pos].partition(":")
+    pos += 1
+    args = []
+    if pos < len(tokens) and tokens[pos] == "<":
+        while True:
+            arg, pos = _parse(tokens, pos + 1, typeStr)
+            args.append(arg)
+            if pos >= len(tokens): raise ValueError(f"Malformed type string {typeStr!r}")
+            if tokens[pos] == ">": break
+            if tokens[pos] != ",": raise ValueError(f"Malformed type string {typeStr!r}")
+        pos += 1
+    return intern(TypeDesc(kind, tuple(args), struct or None)), pos
+
+@lru_cache(maxsize=None)
+def parse_type(typeStr : str) -> TypeDesc:
+    tokens = _tokenize(typeStr)
+    desc, pos = _parse(tokens, 0, typeStr)
+    if pos != len(tokens): raise ValueError(f"Malformed type string {typeStr!r}")
+    return desc
+
+# edit
@@ -1,102 +1,18 @@
 from typing import Callable, Dict
+from collections import OrderedDict
+import functools
+import operator
+from types import SimpleNamespace
+# Engine classes, structs and enums are looked up on first use, see get_engine_types
 import unreal_engine as ue
-from unreal_engine.classes import K2Node_FunctionResult, K2Node_Event, K2Node_CustomEvent
-from unreal_engine.structs import EdGraphPinType, EdGraphTerminalType
-from unreal_engine.enums import EPinContainerType
 
-from enum import IntFlag
 import json
 import LoggingUtil
+import ProfilingUtil
 
 import Tools.FModel as FTools
-
-class PropertyFlags(IntFlag):
-    CPF_None                              = 0x0,
-    CPF_Edit                              = 0x0000000000000001,
-    CPF_ConstParm                         = 0x0000000000000002,
-    CPF_BlueprintVisible                  = 0x0000000000000004,
-    CPF_ExportObject                      = 0x0000000000000008,
-    CPF_BlueprintReadOnly                 = 0x0000000000000010,
-    CPF_Net                               = 0x0000000000000020,
-    CPF_EditFixedSize                     = 0x0000000000000040,
-    CPF_Parm                              = 0x0000000000000080,
-    CPF_OutParm                           = 0x0000000000000100,
-    CPF_ZeroConstructor                   = 0x0000000000000200,
-    CPF_ReturnParm                        = 0x0000000000000400,
-    CPF_DisableEditOnTemplate             = 0x0000000000000800,
-    CPF_Transient                         = 0x0000000000002000,
-    CPF_Config                            = 0x0000000000004000,
-    CPF_DisableEditOnInstance             = 0x0000000000010000,
-    CPF_EditConst                         = 0x0000000000020000,
-    CPF_GlobalConfig                      = 0x0000000000040000,
-    CPF_InstancedReference                = 0x0000000000080000,
-    CPF_DuplicateTransient                = 0x0000000000200000,
-    CPF_SaveGame                          = 0x0000000001000000,
-    CPF_NoClear                           = 0x0000000002000000,
-    CPF_ReferenceParm                     = 0x0000000008000000,
-    CPF_BlueprintAssignable               = 0x0000000010000000,
-    CPF_Deprecated                        = 0x0000000020000000,
-    CPF_IsPlainOldData                    = 0x0000000040000000,
-    CPF_RepSkip                           = 0x0000000080000000,
-    CPF_RepNotify                         = 0x0000000100000000,
-    CPF_Interp                            = 0x0000000200000000,
-    CPF_NonTransactional                  = 0x0000000400000000,
-    CPF_EditorOnly                        = 0x0000000800000000,
-    CPF_NoDestructor                      = 0x0000001000000000,
-    CPF_AutoWeak                          = 0x0000004000000000,
-    CPF_ContainsInstancedReference        = 0x0000008000000000,
-    CPF_AssetRegistrySearchable           = 0x0000010000000000,
-    CPF_SimpleDisplay                     = 0x0000020000000000,
-    CPF_AdvancedDisplay                   = 0x0000040000000000,
-    CPF_Protected                         = 0x0000080000000000,
-    CPF_BlueprintCallable                 = 0x0000100000000000,
-    CPF_BlueprintAuthorityOnly            = 0x0000200000000000,
-    CPF_TextExportTransient               = 0x0000400000000000,
-    CPF_NonPIEDuplicateTransient          = 0x0000800000000000,
-    CPF_ExposeOnSpawn                     = 0x0001000000000000,
-    CPF_PersistentInstance                = 0x0002000000000000,
-    CPF_UObjectWrapper                    = 0x0004000000000000,
-    CPF_HasGetValueTypeHash               = 0x0008000000000000,
-    CPF_NativeAccessSpecifierPublic       = 0x0010000000000000,
-    CPF_NativeAccessSpecifierProtected    = 0x0020000000000000,
-    CPF_NativeAccessSpecifierPrivate      = 0x0040000000000000,
-    CPF_SkipSerialization                 = 0x0080000000000000,
-
-class FunctionFlags(IntFlag):
-    FUNC_None                      = 0x00000000,
-    FUNC_Final                     = 0x00000001,
-    FUNC_RequiredAPI               = 0x00000002,
-    FUNC_BlueprintAuthorityOnly    = 0x00000004,
-    FUNC_BlueprintCosmetic         = 0x00000008,
-    FUNC_Net                       = 0x00000040,
-    FUNC_NetReliable               = 0x00000080,
-    FUNC_NetRequest                = 0x00000100,
-    FUNC_Exec                      = 0x00000200,
-    FUNC_Native                    = 0x00000400,
-    FUNC_Event                     = 0x00000800,
-    FUNC_NetResponse               = 0x00001000,
-    FUNC_Static                    = 0x00002000,
-    FUNC_NetMulticast              = 0x00004000,
-    FUNC_UbergraphFunction         = 0x00008000,
-    FUNC_MulticastDelegate         = 0x00010000,
-    FUNC_Public                    = 0x00020000,
-    FUNC_Private                   = 0x00040000,
-    FUNC_Protected                 = 0x00080000,
-    FUNC_Delegate                  = 0x00100000,
-    FUNC_NetServer                 = 0x00200000,
-    FUNC_HasOutParms               = 0x00400000,
-    FUNC_HasDefaults               = 0x00800000,
-    FUNC_NetClient                 = 0x01000000,
-    FUNC_DLLImport                 = 0x02000000,
-    FUNC_BlueprintCallable         = 0x04000000,
-    FUNC_BlueprintEvent            = 0x08000000,
-    FUNC_BlueprintPure             = 0x10000000,
-    FUNC_EditorOnly                = 0x20000000,
-    FUNC_Const                     = 0x40000000,
-    FUNC_NetValidate               = 0x80000000,
-    FUNC_AllFlags                  = 0xFFFFFFFF,
-
-
+import Tools.Types as Types
+from Tools.Flags import PropertyFlags, FunctionFlags
 
 # FOR Non-Objects ONLY
 # fprop.get_inner().convert()
@@ -177,6 +93,16 @@ BASE_STRUCT_CONSTRUCTORS : Dict[str, Callable[[dict], tuple]] = {
     "FHitResult": lambda v: tuple() # No Init for FHitResult (Not editable in editor anyway)
 }
 
+# Json fields of each math struct, in constructor order
+MATH_STRUCT_FIELDS : Dict[str, tuple] = {
+    "FVector": ("X", "Y", "Z"),
+    "FVector2D": ("X", "Y"),
+    "FRotator": ("Roll", "Pitch", "Yaw"),
+    "FQuat": ("X", "Y", "Z", "W"),
+    "FColor": ("R", "G", "B", "A"),
+    "FLinearColor": ("R", "G", "B", "A"),
+}
+
 SAFE_CREATE_TYPES = (
     *SIMPLE_TYPES, 
     *BASE_STRUCT_CONSTRUCTORS.keys(), 
@@ -186,22 +112,24 @@ SAFE_CREATE_TYPES = (
     "EnumProperty"
 )
 
-def is_type_safe_to_create(typeStr): return typeStr in SAFE_CREATE_TYPES
+# Containers are safe when their elements are
+def is_type_safe_to_create(typeStr):
+    desc = Types.parse_type(typeStr) if isinstance(typeStr, str) else typeStr
+    if desc.kind in (Types.ARRAY, Types.SET): return is_type_safe_to_create(desc.inner)
+    return desc.kind in SAFE_CREATE_TYPES
 
 def create_base_struct(structName, json_value):
     if structName in BASE_STRUCT_CONSTRUCTORS:
         args = BASE_STRUCT_CONSTRUCTORS[structName](json_value)
         return getattr(ue, structName)(*args)
 
-def get_inner_type(typeStr : str):
-    inside = typeStr.split("<")[-1][:-1]
-    if "," in inside:
-        return inside.split(",")
-    else:
-        return inside
-
 # Only UScriptStructs cannot be created/set this way
 def create_from_type_str(baseType, json_value):
+    desc = Types.parse_type(baseType) if isinstance(baseType, str) else baseType
+    if len(desc.args) > 0:
+        return get_converter(desc)(json_value)
+    baseType = desc.kind
+
     if baseType in SIMPLE_TYPES:
         return json_value
     elif baseType in BASE_STRUCT_CONSTRUCTORS:
@@ -232,7 +160,7 @@ def create_from_type_str(baseType, json_value):
             enumClassName, enumValue = json_value.split("::")
             enumClass = find_object(enumClassName)
             if enumClass is None:
-                LoggingUtil.log("Failed to find enum")
+                LoggingUtil.log("Failed to find enum", level=LoggingUtil.WARNING)
                 return 0
             else:
                 if enumValue in enumClass.enum_names():
@@ -240,94 +168,217 @@ def create_from_type_str(baseType, json_value):
                 else: index = 0
                 return index
         else:
-            LoggingUtil.log("Unknown Enum Value")
+            LoggingUtil.log("Unknown Enum Value", level=LoggingUtil.WARNING)
             return 0
         
-def set_struct_from_dict(struct, json_value):
-    struct_type = struct.get_struct().get_name()
-    # FModel seralizes this one weird, need to convert to proper format
+# FModel seralizes some structs differently to their fields, convert to proper format
+def normalize_struct_json(struct_type : str, json_value):
     if struct_type == "GameplayTagContainer": 
-        json_value = {
+        return {
             "GameplayTags": [
                 {
                     "TagName": x
                 } for x in json_value
             ],
         }
-    for field_name in struct.fields():
-        if field_name in json_value:
-            set_property(struct, field_name, json_value.get(field_name))
-
+    return json_value
+
+# Struct path -> (struct name, ((field name, type string, setter), ...))
+_struct_layouts : Dict[str, tuple] = {}
+
+def get_struct_layout(struct):
+    ustruct = struct.get_struct()
+    path = ustruct.get_path_name()
+    layout = _struct_layouts.get(path)
+    if layout is None:
+        layout = (
+            ustruct.get_name(),
+            tuple((field_name, *get_setter(struct, field_name)) for field_name in struct.fields())
+        )
+        _struct_layouts[path] = layout
+    return layout
+
+def fill_struct(layout : tuple, struct, json_value, log : bool = True):
+    struct_type, fields = layout
+    json_value = normalize_struct_json(struct_type, json_value)
+    # Headers are only formatted when they would be kept, silent batches skip them per field
+    log = log and LoggingUtil.is_enabled(LoggingUtil.DEBUG)
+    for field_name, typeStr, setter in fields:
+        if field_name not in json_value: continue
+        if log: LoggingUtil.header(f"{field_name} [{typeStr}]", LoggingUtil.DEBUG, property=field_name)
+        setter(struct, json_value[field_name])
+        if log: LoggingUtil.undent()
 
-def set_property(obj, key : str, json_value):
-    isStruct = isinstance(obj, ue.UScriptStruct)
+def set_struct_from_dict(struct, json_value):
+    fill_struct(get_struct_layout(struct), struct, json_value)
+
+# Fills every element of an ArrayProperty<UScriptStruct>, the layout is resolved once for all elements
+def set_struct_array(fprop, obj, json_values : list):
+    fprop.set_length(obj, len(json_values))
+    if len(json_values) == 0: return
+    layout = get_struct_layout(fprop.get_at_index(obj, 0))
+    if LoggingUtil.is_enabled(LoggingUtil.DEBUG): LoggingUtil.log(f"{len(json_values)} x {layout[0]}", level=LoggingUtil.DEBUG)
+    for i, v in enumerate(json_values):
+        fill_struct(layout, fprop.get_at_index(obj, i), v, False)
+
+# Adds every entry of a MapProperty<_, UScriptStruct>, the layout is resolved once for all values
+def set_struct_map(fprop, obj, items : list, convert_key : Callable):
+    layout = None
+    for item in items:
+        struct = fprop.add_key(obj, convert_key(item["Key"]))
+        if layout is None:
+            layout = get_struct_layout(struct)
+            if LoggingUtil.is_enabled(LoggingUtil.DEBUG): LoggingUtil.log(f"{len(items)} x {layout[0]}", level=LoggingUtil.DEBUG)
+        fill_struct(layout, struct, item["Value"], False)
+
+
+def _identity(json_value): return json_value
+
+# Builds a json array of math structs with the fields and constructor looked up once for the whole array
+# The binding has no bulk constructor so the structs themselves are still created per element
+def create_math_struct_array(structName : str, json_values : list):
+    ctor = getattr(ue, structName)
+    if structName == "FTransform":
+        FVector, FQuat = ue.FVector, ue.FQuat
+        get_vector = operator.itemgetter(*MATH_STRUCT_FIELDS["FVector"])
+        get_quat = operator.itemgetter(*MATH_STRUCT_FIELDS["FQuat"])
+        return [
+            ctor(FVector(*get_vector(v["Translation"])), FQuat(*get_quat(v["Rotation"])), FVector(*get_vector(v["Scale3D"])))
+            for v in json_values
+        ]
+    get_fields = operator.itemgetter(*MATH_STRUCT_FIELDS[structName])
+    return [ctor(*get_fields(v)) for v in json_values]
+
+# Specialized create_from_type_str for a single type string or descriptor
+def get_converter(baseType) -> Callable:
+    desc = Types.parse_type(baseType) if isinstance(baseType, str) else baseType
+    if desc.kind in SIMPLE_TYPES: return _identity
+    if desc.kind == Types.ARRAY and (desc.inner.kind in MATH_STRUCT_FIELDS or desc.inner.kind == "FTransform"):
+        return functools.partial(create_math_struct_array, desc.inner.kind)
+    if desc.kind in (Types.ARRAY, Types.SET):
+        convert_inner = get_converter(desc.inner)
+        container = list if desc.kind == Types.ARRAY else set
+        return lambda json_value: container(convert_inner(x) for x in json_value)
+    return functools.partial(create_from_type_str, desc.kind)
+
+# Builds the setter for one property, the closure does no type string work when called
+def compile_setter(fprop, key : str, typeStr : str, isStruct : bool) -> Callable:
     if isStruct:
-        set_p = obj.set_field
-        get_p = obj.get_field
+        set_p = lambda obj, v: obj.set_field(key, v)
+        get_p = lambda obj: obj.get_field(key)
     else:
-        set_p = obj.set_property
-        get_p = obj.get_property
-
-    fprop = obj.get_fproperty(key)
-    typeStr = fprop.get_type_str()
-    baseType = typeStr.split("<")[0]
-
-    LoggingUtil.header(f"{key} [{typeStr}]")
-
-    wasSet = True
-    if is_type_safe_to_create(baseType):
-        v = create_from_type_str(baseType, json_value)
-        if v is not None and baseType != "ObjectProperty":
-            set_p(key, v)
-    elif baseType == "UScriptStruct":
-        struct = get_p(key)
-        set_struct_from_dict(struct, json_value)
-    elif baseType == "ArrayProperty":
-        innerType = get_inner_type(typeStr)
+        set_p = lambda obj, v: obj.set_property(key, v)
+        get_p = lambda obj: obj.get_property(key)
+
+    desc = Types.parse_type(typeStr)
+    baseType = desc.kind
+
+    if not desc.is_container() and is_type_safe_to_create(desc):
+        convert = get_converter(desc)
+        if baseType == "ObjectProperty":
+            def setter(obj, json_value):
+                convert(json_value)
+                return True
+        else:
+            def setter(obj, json_value):
+                v = convert(json_value)
+                if v is not None:
+                    set_p(obj, v)
+                return True
+    elif baseType == Types.STRUCT:
+        def setter(obj, json_value):
+            set_struct_from_dict(get_p(obj), json_value)
+            return True
+    elif baseType == Types.ARRAY:
+        innerType = desc.inner
         if is_type_safe_to_create(innerType):
-            set_p(key, [
-                create_from_type_str(innerType, x) for x in json_value
-            ])
-        elif innerType == "UScriptStruct":
-            if json_value is not None:
-                fprop.set_length(obj, len(json_value))
-                for i, v in enumerate(json_value):
-                    set_struct_from_dict(fprop.get_at_index(obj, i), v)
+            convert = get_converter(desc)
+            def setter(obj, json_value):
+                set_p(obj, convert(json_value))
+                return True
+        elif innerType.kind == Types.STRUCT:
+            def setter(obj, json_value):
+                if json_value is not None:
+                    set_struct_array(fprop, obj, json_value)
+                return True
         else:
-            LoggingUtil.log("Unknown Inner Type")
-            wasSet = False
-    elif baseType == "SetProperty":
-        innerType = get_inner_type(typeStr)
+            def setter(obj, json_value):
+                LoggingUtil.log("Unknown Inner Type", level=LoggingUtil.WARNING)
+                return False
+    elif baseType == Types.SET:
+        innerType = desc.inner
         if is_type_safe_to_create(innerType):
-            set_p(key, set(
-                create_from_type_str(innerType, x) for x in json_value
-            ))
+            convert = get_converter(innerType)
+            def setter(obj, json_value):
+                set_p(obj, set(convert(x) for x in json_value))
+                return True
         else:
-            LoggingUtil.log("Unknown Inner Type")
-            wasSet = False
-    elif baseType == "MapProperty":
-        innerKeyType, innerValueType = get_inner_type(typeStr)
-        if json_value is None: json_value = []
-        fixed_dict = FTools.normalize_dictionary(json_value)
+            def setter(obj, json_value):
+                LoggingUtil.log("Unknown Inner Type", level=LoggingUtil.WARNING)
+                return False
+    elif baseType == Types.MAP:
+        innerKeyType, innerValueType = desc.key, desc.value
+        convert_key = get_converter(innerKeyType)
 
         if is_type_safe_to_create(innerValueType):
-            for item in fixed_dict:
-                fprop.add_key_value(
-                    obj, 
-                    create_from_type_str(innerKeyType, item["Key"]),
-                    create_from_type_str(innerValueType, item["Value"])
-                )
-        elif innerValueType == "UScriptStruct": 
-            for item in fixed_dict:
-                struct = fprop.add_key(obj, create_from_type_str(innerKeyType, item["Key"]))
-                set_struct_from_dict(struct, item["Value"])
+            convert_value = get_converter(innerValueType)
+            def setter(obj, json_value):
+                if json_value is None: json_value = []
+                for item in FTools.normalize_dictionary(json_value):
+                    fprop.add_key_value(obj, convert_key(item["Key"]), convert_value(item["Value"]))
+                return True
+        elif innerValueType.kind == Types.STRUCT:
+            def setter(obj, json_value):
+                if json_value is None: json_value = []
+                set_struct_map(fprop, obj, FTools.normalize_dictionary(json_value), convert_key)
+                return True
         else:
-            wasSet = False
+            def setter(obj, json_value):
+                return False
     else:
-        LoggingUtil.log("UNHANDELLED")
-        wasSet = False
-        
-    LoggingUtil.undent()
+        def setter(obj, json_value):
+            LoggingUtil.log("UNHANDELLED", level=LoggingUtil.WARNING)
+            return False
+
+    return setter
+
+# (owner class or struct path, property name) -> (type string, setter)
+_setter_cache : Dict[tuple, tuple] = {}
+
+def get_setter(obj, key : str):
+    isStruct = isinstance(obj, ue.UScriptStruct)
+    owner = obj.get_struct() if isStruct else obj.get_class()
+    cache_key = (owner.get_path_name(), key)
+
+    compiled = _setter_cache.get(cache_key)
+    if compiled is None:
+        fprop = obj.get_fproperty(key)
+        typeStr = fprop.get_type_str()
+        compiled = (typeStr, compile_setter(fprop, key, typeStr, isStruct))
+        _setter_cache[cache_key] = compiled
+    return compiled
+
+# Drops setters and struct layouts of types in a package, or all of them when no package is given
+def clear_setter_cache(package : str = None):
+    if package is None:
+        _setter_cache.clear()
+        _struct_layouts.clear()
+        return
+    for key in [k for k in _setter_cache if k[0].split(".")[0] == package]:
+        del _setter_cache[key]
+    for key in [k for k in _struct_layouts if k.split(".")[0] == package]:
+        del _struct_layouts[key]
+
+@ProfilingUtil.timed("ue.set_property")
+def set_property(obj, key : str, json_value):
+    typeStr, setter = get_setter(obj, key)
+
+    debug = LoggingUtil.is_enabled(LoggingUtil.DEBUG)
+    if debug: LoggingUtil.header(f"{key} [{typeStr}]", LoggingUtil.DEBUG, property=key)
+    wasSet = setter(obj, json_value)
+    if not wasSet and LoggingUtil.is_enabled(LoggingUtil.WARNING):
+        LoggingUtil.log(f"Not set {key}", level=LoggingUtil.WARNING, property=key, outcome="not set")
+    if debug: LoggingUtil.undent()
     return wasSet
 
 
@@ -340,20 +391,47 @@ def get_function_entry(func):
         if node.get_class() == ue.find_class("/Script/BlueprintGraph.K2Node_FunctionEntry"):
             return node
 
+# Engine types used per pin, variable and node, each import is a lookup in the editor so they are resolved once
+_engine_types = None
+
+def get_engine_types():
+    global _engine_types
+    if _engine_types is None:
+        from unreal_engine.classes import K2Node_FunctionResult, K2Node_Event, K2Node_CustomEvent
+        from unreal_engine.structs import EdGraphPinType, EdGraphTerminalType, BPVariableDescription
+        from unreal_engine.enums import EPinContainerType, EEdGraphPinDirection
+        _engine_types = SimpleNamespace(
+            K2Node_FunctionResult=K2Node_FunctionResult,
+            K2Node_Event=K2Node_Event,
+            K2Node_CustomEvent=K2Node_CustomEvent,
+            EdGraphPinType=EdGraphPinType,
+            EdGraphTerminalType=EdGraphTerminalType,
+            BPVariableDescription=BPVariableDescription,
+            EPinContainerType=EPinContainerType,
+            EEdGraphPinDirection=EEdGraphPinDirection,
+        )
+    return _engine_types
+
 def get_function_return(func):
+    result_class = get_engine_types().K2Node_FunctionResult
     for node in func.Nodes:
-        if node.get_class() == K2Node_FunctionResult:
+        if node.get_class() == result_class:
             return node
 
-def find_object(objRef):
-    obj = None
+# (class name, object path) the reference resolves to, both hits and misses are cached under it
+def get_object_cache_key(objRef):
+    if isinstance(objRef, dict):
+        if "ObjectName" in objRef and "ObjectPath" in objRef:
+            _basePath = FTools.split_object_path(objRef["ObjectPath"])[0]
+            _assetType, _assetName = (objRef["ObjectName"].split("'") + ["", ""])[:2]
+            return (_assetType, f"{_basePath}.{_assetName}")
+        return ("", objRef.get("ObjectName"))
+    return ("", objRef)
 
+def _resolve_object(objRef):
     if isinstance(objRef, dict):
         if "ObjectName" in objRef and "ObjectPath" in objRef:
-            _basePath = objRef["ObjectPath"].split(".")[0]
-            _assetName = objRef["ObjectName"].split("'")[1]
-            _assetType = objRef["ObjectName"].split("'")[0]
-            name = f"{_basePath}.{_assetName}"
+            _assetType, name = get_object_cache_key(objRef)
             try:
                 return ue.load_object(ue.find_class(_assetType), name)
             except:
@@ -362,80 +440,93 @@ def find_object(objRef):
             name = objRef["ObjectName"]
     else:
         name = objRef
-    
 
     try:
         return ue.find_object(name)
     except:
         pass
 
-    if obj is None:
-        LoggingUtil.log(f"Failed to find {name}")
-        return None
+    if catalog is not None:
+        obj = _resolve_from_catalog(name, _assetType if isinstance(objRef, dict) and "ObjectPath" in objRef else "")
+        if obj is not None: return obj
 
-    return obj
+    LoggingUtil.log(f"Failed to find {name}", level=LoggingUtil.WARNING, outcome="not found")
+    return None
 
+# Tools.Catalog.Catalog asked where unresolved names are defined, see set_catalog
+catalog = None
 
-def resolve_property_type(props):
-    kwargs = {}
+def set_catalog(value = None):
+    global catalog
+    catalog = value
+    invalidate_object_cache()
 
-    if props["Type"].endswith("Property"):
-        kwargs["Type"] = props["Type"][:-len("Property")].lower()
-
-    if props["Type"] == "ObjectProperty":
-        kwargs["Ref"] = find_object(props["PropertyClass"])
-    elif props["Type"] == "ClassProperty":
-        kwargs["Ref"] = find_object(props["MetaClass"])
-    elif props["Type"] == "SoftObjectProperty":
-        kwargs["Ref"] = find_object(props["PropertyClass"])
-    elif props["Type"] == "SoftClassProperty":
-        kwargs["Ref"] = find_object(props["MetaClass"])
-    elif props["Type"] == "StructProperty":
-        kwargs["Ref"] = find_object(props["Struct"])
-    elif props["Type"] == "ByteProperty" and props.get("Enum", None) is not None:
-        kwargs["Ref"] = find_object(props["Enum"])
-    elif props["Type"] == "EnumProperty":
-        kwargs["Type"] = "byte"
-        kwargs["Ref"] = find_object(props["Enum"])
-    elif props["Type"] == "StrProperty":
-        kwargs["Type"] = "String"
-    elif props["Type"] == "InterfaceProperty":
-        kwargs["Type"] = "interface"
-        kwargs["Ref"] = find_object(props["InterfaceClass"])
-
-    return kwargs
-
-def create_pin_type(props):
-    kwargs = {}
+def _resolve_from_catalog(name : str, assetType : str = ""):
+    # "Class'Name'", "/Game/Path/Package.Name" or "Outer:Name"
+    if "'" in name: name = name.split("'")[1]
+    name = name.split(":")[-1].split(".")[-1]
+    package = catalog.find_package(name)
+    if package is None: return None
+    try:
+        if assetType != "":
+            return ue.load_object(ue.find_class(assetType), f"{package}.{name}")
+        return ue.find_object(f"{package}.{name}")
+    except:
+        return None
 
-    if props["Type"] == "ArrayProperty":
-        props = props["Inner"]
-        kwargs["ContainerType"] = EPinContainerType.Array
-    elif props["Type"] == "MapProperty":
-        kwargs["ContainerType"] = EPinContainerType.Map
-        valueRes = resolve_property_type(props["ValueProp"])
+OBJECT_CACHE_SIZE = 8192
+_object_cache : "OrderedDict[tuple, object]" = OrderedDict()
 
-        valueKwargs = {
-            "TerminalCategory": valueRes["Type"]
-        }
+def find_object(objRef):
+    try:
+        key = get_object_cache_key(objRef)
+        if key in _object_cache:
+            _object_cache.move_to_end(key)
+            ProfilingUtil.count("ue.find_object.cached")
+            return _object_cache[key]
+    except TypeError:
+        # Unhashable reference, resolve without caching
+        with ProfilingUtil.span("ue.find_object"):
+            return _resolve_object(objRef)
+
+    with ProfilingUtil.span("ue.find_object"):
+        obj = _resolve_object(objRef)
+    _object_cache[key] = obj
+    if len(_object_cache) > OBJECT_CACHE_SIZE:
+        _object_cache.popitem(last=False)
+    return obj
+
+# Drops cached lookups for a package ("/Game/Path/Asset"), or everything when no package is given.
+# Must be called once assets are created or saved so cached misses don't hide them
+def invalidate_object_cache(package : str = None):
+    if package is None:
+        _object_cache.clear()
+        return
+    for key in [k for k in _object_cache if isinstance(k[1], str) and k[1].split(".")[0] == package]:
+        del _object_cache[key]
 
-        if "Ref" in valueRes:
-            valueKwargs["TerminalSubCategoryObject"] = valueRes["Ref"]
 
-        kwargs["PinValueType"] = EdGraphTerminalType(**valueKwargs)
+def create_pin_type_from_plan(planned):
+    engine = get_engine_types()
+    kwargs = {}
+
+    if "ContainerType" in planned:
+        kwargs["ContainerType"] = getattr(engine.EPinContainerType, planned["ContainerType"])
 
-        props = props["KeyProp"]
-    elif props["Type"] == "SetProperty":
-        props = props["ElementProp"]
-        kwargs["ContainerType"] = EPinContainerType.Set
+    if "PinValueType" in planned:
+        valueKwargs = dict(planned["PinValueType"])
+        if "TerminalSubCategoryObject" in valueKwargs:
+            valueKwargs["TerminalSubCategoryObject"] = find_object(valueKwargs["TerminalSubCategoryObject"])
+        kwargs["PinValueType"] = engine.EdGraphTerminalType(**valueKwargs)
 
-    res = resolve_property_type(props)
-    kwargs["PinCategory"] = res["Type"]
+    kwargs["PinCategory"] = planned["PinCategory"]
 
-    if "Ref" in res:
-        kwargs["PinSubCategoryObject"] = res["Ref"]
+    if "PinSubCategoryObject" in planned:
+        kwargs["PinSubCategoryObject"] = find_object(planned["PinSubCategoryObject"])
 
-    return EdGraphPinType(**kwargs)
+    return engine.EdGraphPinType(**kwargs)
 
 def get_event_nodes(graph):
-    return tuple(x for x in graph.Nodes if x.get_class() in (K2Node_Event, K2Node_CustomEvent))
\ No newline at end of file
+    engine = get_engine_types()
+    event_classes = (engine.K2Node_Event, engine.K2Node_CustomEvent)
+    return tuple(x for x in graph.Nodes if x.get_class() in event_classes)
\ No newline at end of file
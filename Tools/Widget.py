@@ -0,0 +1,139 @@
+'''
+Editor independent side of the widget conversion.
+
+plan_widget flattens the tree of an export into a json serializable list that WidgetUtil.apply_plan replays in the editor.
+'''
+
+from typing import Dict, List
+
+import ProfilingUtil
+
+import Tools.FModel as FTools
+import Tools.Pool as Pool
+
+GENERATED_CLASS = "WidgetBlueprintGeneratedClass"
+
+# How a child hangs off its parent, matches the property it is assigned to
+SLOT = "Slots"
+CONTENT = "Content"
+
+class WidgetJson:
+    """
+    Widget tree of an FModel WidgetBlueprint export.
+    References are resolved once by link() into a parent -> children table so the tree can be walked without recursion.
+    """
+    path : str
+    fmodel : FTools.FModelJson
+    outer_name = ""
+    __children : Dict[int, List[tuple]]
+
+    def __init__(self, path : str, streaming : bool = False):
+        self.path = path
+        self.fmodel = FTools.FModelJson(path, streaming)
+        self.__children = {}
+        # Remove the _C
+        self.outer_name = self.get_node(self.find_tree_root())["Outer"][:-2]
+
+    def get_node(self, index : int): return self.fmodel[index]
+
+    def get_by_name(self, name : str): return self.fmodel.get_by_name(name)
+
+    def find_generated_class(self):
+        for node in self.fmodel.query(Type=GENERATED_CLASS):
+            if "Properties" in node: return node
+
+    def get_package_path(self):
+        return FTools.split_object_path(self.find_generated_class()["ClassDefaultObject"]["ObjectPath"])[0]
+
+    # Export index an ObjectPath reference points at, None if it is outside this export
+    def resolve(self, ref):
+        if ref is None: return None
+        origin, index = FTools.split_object_path(ref["ObjectPath"])
+        origin = origin.split("/")[-1]
+        if origin != self.outer_name and self.outer_name != "":
+            return None
+        return int(index)
+
+    def find_tree_root(self):
+        return self.resolve(self.find_generated_class()["Properties"]["WidgetTree"])
+
+    def find_root_widget(self):
+        return self.resolve(self.get_node(self.find_tree_root())["Properties"]["RootWidget"])
+
+    # Single pass over every node reachable from root, filling the children table
+    def link(self, root : int):
+        stack = [root]
+        seen = set(stack)
+        while len(stack) > 0:
+            index = stack.pop()
+            props = self.get_node(index).get("Properties", {})
+            children = []
+            for s in props.get(SLOT, []):
+                child = self.resolve(s)
+                if child is not None: children.append((child, SLOT))
+            if CONTENT in props:
+                child = self.resolve(props[CONTENT])
+                if child is not None: children.append((child, CONTENT))
+            self.__children[index] = children
+            for child, _ in children:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+
+    # [(child index, SLOT or CONTENT)] in property order
+    def children(self, index : int):
+        if index not in self.__children: self.link(index)
+        return self.__children[index]
+
+    # Depth first, parents before children and siblings in property order: [(index, parent index, relation)]
+    def walk(self, root : int):
+        order = []
+        stack = [(root, None, None)]
+        while len(stack) > 0:
+            index, parent, relation = stack.pop()
+            order.append((index, parent, relation))
+            for child, child_relation in reversed(self.children(index)):
+                stack.append((child, index, child_relation))
+        return order
+
+    def close(self):
+        self.fmodel.close()
+
+# Widgets in creation order, Parent is the Index of an earlier entry and Relation the property it is assigned to
+@ProfilingUtil.timed("widget.plan")
+def plan_widget(widget_json : WidgetJson, source : str = ""):
+    widgets = []
+    for index, parent, relation in widget_json.walk(widget_json.find_root_widget()):
+        node = widget_json.get_node(index)
+        widgets.append({
+            "Index": index,
+            "Parent": parent,
+            "Relation": relation,
+            "Name": node["Name"],
+            "Type": node["Type"],
+            "Class": node.get("Class"),
+            "Outer": node["Outer"],
+            "Properties": node.get("Properties", {}),
+        })
+
+    return {
+        "Source": source,
+        "Package": widget_json.get_package_path(),
+        "Widgets": widgets,
+    }
+
+def plan_widget_file(path : str):
+    widget_json = WidgetJson(path)
+    try:
+        return plan_widget(widget_json, path)
+    finally:
+        widget_json.close()
+
+# Plans every export in paths concurrently, returns ({ path: plan }, { path: error })
+def plan_widget_files(paths, max_workers : int = None, processes : bool = False):
+    plans = {}
+    failed = {}
+    for path, plan, error in Pool.map_guarded(plan_widget_file, paths, max_workers, processes):
+        if error is None: plans[path] = plan
+        else: failed[path] = error
+    return plans, failed
@@ -12,22 +12,29 @@ def get_class_by_path(path):
 
 import unreal_engine as ue
 
-STRUCT_MAP = {
-    ue.FVector2D: get_class_by_path("Vector2D"),
-    ue.FLinearColor: get_class_by_path("LinearColor")
-}
+# Resolved on first use, find_class at import time slows down every editor session
+_struct_map = None
+
+def get_struct_map():
+    global _struct_map
+    if _struct_map is None:
+        _struct_map = {
+            ue.FVector2D: get_class_by_path("Vector2D"),
+            ue.FLinearColor: get_class_by_path("LinearColor")
+        }
+    return _struct_map
 
 
         
 def create_struct_from_dict(struct, props):
-    struct = STRUCT_MAP.get(struct, struct)
+    struct = get_struct_map().get(struct, struct)
     kwargs = {}
     print(struct)
     structKeys = struct.properties()
     structDict = struct.as_dict()
     for key in structKeys:
         if key not in props: continue
-        valueTy = STRUCT_MAP.get(type(structDict[key]), type(structDict[key]))
+        valueTy = get_struct_map().get(type(structDict[key]), type(structDict[key]))
 
         if valueTy == ue.UScriptStruct:
             kwargs[key] = create_struct_from_dict(valueTy.get_struct(), props[key])
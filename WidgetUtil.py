@@ -1,40 +1,14 @@
-import json
+import traceback
+
 import LoggingUtil
+import ProfilingUtil
 import UEUtil
+from Tools.Widget import WidgetJson, SLOT, CONTENT, plan_widget, plan_widget_files
 
-nodes = []
-outer_name = ""
-
-def load(path):
-    global nodes, outer_name
-    with open(path, "r+", encoding="utf8") as fp:
-        nodes = json.load(fp)
-        # Remove the _C
-        outer_name = find_tree_root()["Outer"][:-2]
-        
-
-def node_has_keys(node, *keys):
-    for key in keys:
-        if key not in node:
-            return False
-    return True
-
-def find_tree_root():
-    for node in nodes:
-        if node_has_keys(node, "Type", "Properties"):
-            if node["Type"] == "WidgetBlueprintGeneratedClass":
-                return follow_object_ref(node["Properties"]["WidgetTree"])
-            
-
-def get_by_index(index):
-    return nodes[index]
-
-def follow_object_ref(ref):
-    origin, index = ref["ObjectPath"].split(".")
-    origin = origin.split("/")[-1]
-    if origin != outer_name and outer_name != "": 
-        return None
-    return get_by_index(int(index))
+# Streaming keeps only an offset index of the exports and decodes nodes as the tree is walked
+@ProfilingUtil.timed("widget.load")
+def load(path, streaming = False) -> WidgetJson:
+    return WidgetJson(path, streaming)
 
 def get_class_for_node(node : dict):
     return UEUtil.get_class_by_path(node["Class"])
@@ -64,47 +38,116 @@ def get_class_for_node(node : dict):
 #             set_properties(getattr(obj, keyMap.get(key, key)), value, ["Hex"], {x: x.lower() for x in value.keys()})
         
 
-def recursive_parse_node(node : dict, tree, outer, allWidgets):
-    LoggingUtil.header(node["Name"])
-    clz = get_class_for_node(node)
-
-    props : dict = node.get("Properties", {})
-
-    if clz is None:
-        LoggingUtil.log(f"No Class {node['Type']}")
-        LoggingUtil.undent()
-        return None
-    
-    current_outer = tree if node["Outer"] == "WidgetTree" else outer
-    widgetObj = clz(node["Name"], current_outer)
-
-    if node["Outer"] == "WidgetTree":
-        allWidgets.append(widgetObj)
-
-    if widgetObj is None:
-        LoggingUtil.undent()
-        return None
-
-    if "Slots" in props:
-        newSlots = []
-        for s in props["Slots"]:
-            child = follow_object_ref(s)
-            if child is not None: 
-                newSlot = recursive_parse_node(child, tree, widgetObj, allWidgets)
-                if newSlot != None: newSlots.append(newSlot)
-
-        widgetObj.Slots = newSlots
-
-    if "Content" in props:
-        child = follow_object_ref(props["Content"])
-        if child is not None:
-            newWidget = recursive_parse_node(child, tree, widgetObj, allWidgets)
-            if newWidget is not None: widgetObj.Content = newWidget
-
-
-    # set_properties(widgetObj, props, ["Slots", "Slot", "Content", "Parent"])
-
-    UEUtil.set_properties_by_json(widgetObj, props, ["Slots", "Slot", "Content", "Parent"])
-
-    LoggingUtil.undent()
-    return widgetObj
\ No newline at end of file
+# Creates the planned widgets under tree, returns the root widget object
+@ProfilingUtil.timed("widget.build_tree")
+def build_tree(widgets : list, tree, allWidgets):
+    created = {}
+    order = []
+    children = {}
+
+    # Parents first so each widget can be created inside its outer
+    for planned in widgets:
+        parent = planned["Parent"]
+        if parent is not None and parent not in created: continue
+        LoggingUtil.log(planned["Name"], level=LoggingUtil.DEBUG, object=planned["Name"])
+        clz = get_class_for_node(planned)
+
+        if clz is None:
+            LoggingUtil.log(f"No Class {planned['Type']}", level=LoggingUtil.WARNING, object=planned["Name"], outcome="no class")
+            continue
+
+        outer = tree if parent is None else created[parent]
+        current_outer = tree if planned["Outer"] == "WidgetTree" else outer
+        widgetObj = clz(planned["Name"], current_outer)
+
+        if planned["Outer"] == "WidgetTree":
+            allWidgets.append(widgetObj)
+
+        if widgetObj is None: continue
+        created[planned["Index"]] = widgetObj
+        order.append(planned)
+        if parent is not None: children.setdefault(parent, []).append(planned)
+
+    # Children first so slots and content are complete before a parent's properties are set
+    for planned in reversed(order):
+        widgetObj = created[planned["Index"]]
+        props : dict = planned["Properties"]
+        planned_children = children.get(planned["Index"], [])
+
+        if SLOT in props:
+            widgetObj.Slots = [created[child["Index"]] for child in planned_children if child["Relation"] == SLOT]
+
+        for child in planned_children:
+            if child["Relation"] == CONTENT: widgetObj.Content = created[child["Index"]]
+
+        UEUtil.set_properties_by_json(widgetObj, props, ["Slots", "Slot", "Content", "Parent"])
+
+    return created.get(widgets[0]["Index"]) if len(widgets) > 0 else None
+
+# Builds the planned widget tree into the WidgetBlueprint at out_path, defaults to the package of the export
+# Without compile the caller is expected to pass the widget to compile_all
+@ProfilingUtil.timed("widget.apply_plan")
+def apply_plan(plan : dict, out_path = None, compile = True):
+    import unreal_engine as ue
+    from unreal_engine.classes import WidgetBlueprintFactory, WidgetBlueprint
+
+    if out_path is None: out_path = plan["Package"]
+
+    try:
+        widget = ue.load_object(WidgetBlueprint, out_path)
+    except:
+        widget = WidgetBlueprintFactory().factory_create_new(out_path)
+
+    widget.modify()
+    # TODO: Set Widget Parent Class
+    tree = widget.WidgetTree
+
+    tree.AllWidgets.clear()
+
+    allWidgets = []
+
+    newRoot = build_tree(plan["Widgets"], tree, allWidgets)
+
+    tree.RootWidget = newRoot
+    tree.allWidgets = allWidgets
+
+    widget.post_edit_change()
+    if compile: compile_all([widget])
+    return widget
+
+@ProfilingUtil.timed("widget.compile")
+def compile_all(widgets : list):
+    import unreal_engine as ue
+    import Tools.UE as UETools
+
+    for widget in widgets:
+        ue.compile_blueprint(widget)
+        UETools.invalidate_object_cache(widget.get_path_name().split(".")[0])
+
+# Builds the widget tree of widget_json into the WidgetBlueprint at out_path
+def generate(widget_json : WidgetJson, out_path):
+    return apply_plan(plan_widget(widget_json, widget_json.path), out_path)
+
+# Plans every export concurrently, then creates the assets one by one on the game thread and compiles them together
+# Each asset is written to the package of its export with out_suffix appended
+# Returns { "Converted": [package], "Failed": { path or package: error } }
+def generate_batch(paths, max_workers = None, out_suffix : str = ""):
+    plans, failed = plan_widget_files(paths, max_workers)
+
+    widgets = []
+    converted = []
+    for path in paths:
+        if path not in plans: continue
+        plan = plans[path]
+        out_path = plan["Package"] + out_suffix
+        LoggingUtil.set_context(asset=out_path)
+        try:
+            widgets.append(apply_plan(plan, out_path, compile=False))
+            converted.append(out_path)
+        except Exception:
+            failed[path] = traceback.format_exc()
+            LoggingUtil.log(failed[path], level=LoggingUtil.ERROR, outcome="failed")
+    LoggingUtil.set_context(asset=None)
+
+    compile_all(widgets)
+    return {"Converted": converted, "Failed": failed}